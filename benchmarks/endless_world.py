@@ -0,0 +1,68 @@
+"""Benchmark of travelling through an endless world: time to enter each room and memory held along the way
+
+The walker follows the hints of the world from room to room, down through the chunks, spending some time in every
+room as a player would. Entering a room of a new chunk must not stall, since the chunk was generated ahead on a
+background thread, and memory must not grow with the distance travelled. Run with `python -m benchmarks.endless_world`.
+"""
+import statistics
+import time
+import tracemalloc
+from argparse import ArgumentParser
+
+from src.GameObjects.game_objects import EndlessWorld
+
+MOVES = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+
+
+def traced_world_memory() -> int:
+    """The memory traced outside of this benchmark, whose own timings grow with the distance travelled"""
+    snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, __file__)])
+    return sum(statistic.size for statistic in snapshot.statistics('filename'))
+
+
+def main() -> None:
+    """Run the benchmark"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--chunks', type=int, default=200, help='number of chunks to travel through')
+    parser.add_argument('--width', type=int, default=15)
+    parser.add_argument('--chunk-height', type=int, default=15)
+    parser.add_argument('--room-time', type=float, default=0.002, help='seconds spent in every room')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    world = EndlessWorld(args.width, args.chunk_height, args.seed)
+    enter_times = []
+    boundary_times = []
+    memory = []
+
+    target_row = args.chunks * args.chunk_height
+    while world.world_location[0] < target_row:
+        row_index, column_index = world.world_location
+        row_step, column_step = MOVES[world.hint()]
+        time.sleep(args.room_time)
+
+        start = time.perf_counter()
+        world.update_world_location(row_index + row_step, column_index + column_step)
+        elapsed = time.perf_counter() - start
+
+        enter_times.append(elapsed)
+        if world.world_location[0] % args.chunk_height == 0 and row_step == 1:
+            boundary_times.append(elapsed)
+            memory.append(traced_world_memory())
+    world.close()
+    tracemalloc.stop()
+
+    enter_us = sorted(elapsed * 1e6 for elapsed in enter_times)
+    print(f"{len(enter_us)} rooms entered across {args.chunks} chunks of {args.width}x{args.chunk_height}")
+    print(f"  enter room p50:           {statistics.median(enter_us):8.1f} us")
+    print(f"  enter room p99:           {enter_us[int(len(enter_us) * 0.99) - 1]:8.1f} us")
+    print(f"  enter room max:           {enter_us[-1]:8.1f} us")
+    print(f"  enter new chunk max:      {max(boundary_times) * 1e6:8.1f} us")
+    print(f"  chunks kept:              {world.raw_matrix.chunks_kept:8d}")
+    tenth = max(len(memory) // 10, 1)
+    print("  traced memory by chunk:   " + ", ".join(f"{size / 1024:.0f} KiB" for size in memory[::tenth]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark of the number of writes and bytes per frame with and without frame batching
+
+Run with `python -m benchmarks.frame_output`.
+"""
+import queue
+import random
+from argparse import ArgumentParser
+from functools import partial
+
+from blessed import Terminal
+from blessed.keyboard import Keystroke
+
+from src.sections.game_over import GameOver
+from src.sections.menu import Menu, StartMenuType
+from src.sections.over_world import OverWorld, StartOverWorld
+from src.util.frame_writer import FrameWriter
+
+
+class CountingStream:
+    """A text stream without a file descriptor that counts the writes made to it"""
+
+    encoding = 'utf8'
+
+    def __init__(self):
+        self.writes = 0
+        self.bytes_written = 0
+
+    def write(self, text: str) -> int:
+        """Count a write, empty writes never reach the terminal"""
+        if text:
+            self.writes += 1
+        self.bytes_written += len(text.encode(self.encoding))
+        return len(text)
+
+    def flush(self) -> None:
+        """Nothing to flush"""
+        pass
+
+
+def over_world_frames(terminal: Terminal, echo: object, frames: int) -> None:
+    """Render the over world while the player walks in a small square"""
+    section = OverWorld(queue.Queue())
+    section.handle_start(StartOverWorld('😎', True))
+    for index in range(frames):
+        section.run_processing(Keystroke('x', code=1, name=('KEY_LEFT', 'KEY_DOWN', 'KEY_RIGHT', 'KEY_UP')[index % 4]))
+        section.run_rendering(terminal, echo)
+        getattr(echo, 'flush', lambda: None)()
+
+
+def menu_frames(terminal: Terminal, echo: object, frames: int) -> None:
+    """Render the start menu while the selection moves down"""
+    section = Menu(queue.Queue())
+    section.handle_start(StartMenuType())
+    for _ in range(frames):
+        section.run_processing(Keystroke('s'))
+        section.run_rendering(terminal, echo)
+        getattr(echo, 'flush', lambda: None)()
+
+
+def game_over_frames(terminal: Terminal, echo: object, frames: int) -> None:
+    """Render the game over screen"""
+    section = GameOver(queue.Queue())
+    section.handle_start(None)
+    for _ in range(frames):
+        section.run_rendering(terminal, echo)
+        getattr(echo, 'flush', lambda: None)()
+
+
+def main() -> None:
+    """Run the benchmark"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    terminal = Terminal(kind='xterm-256color', stream=CountingStream(), force_styling=True)
+    for name, scene in [('over world', over_world_frames), ('menu', menu_frames), ('game over', game_over_frames)]:
+        print(f"{name}:")
+
+        random.seed(args.seed)
+        legacy_stream = CountingStream()
+        scene(terminal, partial(print, end='', flush=True, file=legacy_stream), args.frames)
+        print(f"  print per echo: {legacy_stream.writes / args.frames:8.1f} writes/frame"
+              f" {legacy_stream.bytes_written / args.frames:8.1f} bytes/frame")
+
+        random.seed(args.seed)
+        writer = FrameWriter(CountingStream())
+        scene(terminal, writer, args.frames)
+        print(f"  frame writer:   {writer.writes / args.frames:8.1f} writes/frame"
+              f" {writer.bytes_written / args.frames:8.1f} bytes/frame")
+
+
+if __name__ == '__main__':
+    main()
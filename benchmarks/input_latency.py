@@ -0,0 +1,97 @@
+"""Benchmark of idle CPU use and keypress latency of the GameSection main loop
+
+Run with `python -m benchmarks.input_latency`.
+"""
+import io
+import queue
+import statistics
+import threading
+import time
+from argparse import ArgumentParser
+from typing import Callable, Optional
+
+from blessed import Terminal
+from blessed.keyboard import Keystroke
+
+from src.sections.base import GameSection
+
+
+class IdleSection(GameSection):
+    """A section that records when each keystroke reaches run_processing"""
+
+    def __init__(self, in_queue: queue.Queue):
+        super().__init__(in_queue)
+        self.received = []
+
+    def handle_start(self, start_data: object) -> bool:
+        """Inherit"""
+        return False
+
+    def run_processing(self, inp: Optional[Keystroke]) -> bool:
+        """Inherit"""
+        if inp == 'q':
+            self.stop()
+        elif inp is not None:
+            self.received.append(time.perf_counter())
+        return False
+
+    def run_rendering(self, terminal: Terminal, echo: Callable[[str], None]) -> None:
+        """Inherit"""
+        pass
+
+    def handle_stop(self) -> object:
+        """Inherit"""
+        return None
+
+
+class BusyPollingSection(IdleSection):
+    """The same section polling its queue without blocking, as the loop used to"""
+
+    def _get_input(self, deadline: Optional[float] = None) -> Optional[str]:
+        try:
+            return self._in_queue.get_nowait()
+        except queue.Empty:
+            return None
+
+
+def measure(section_cls: type, idle_seconds: float, presses: int) -> tuple[float, list[float]]:
+    """Returns the CPU use while idle (in percent of a core) and the keypress latencies (in seconds)"""
+    in_queue = queue.Queue()
+    section = section_cls(in_queue)
+    thread = threading.Thread(target=section, args=(Terminal(stream=io.StringIO()), None))
+    thread.start()
+    time.sleep(0.1)
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    time.sleep(idle_seconds)
+    idle_cpu = (time.process_time() - cpu_start) / (time.perf_counter() - wall_start) * 100
+
+    sent_at = []
+    for _ in range(presses):
+        sent_at.append(time.perf_counter())
+        in_queue.put(Keystroke('x'))
+        time.sleep(0.005)
+
+    in_queue.put(Keystroke('q'))
+    thread.join()
+    return idle_cpu, [received - sent for received, sent in zip(section.received, sent_at)]
+
+
+def main() -> None:
+    """Run the benchmark"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--idle', type=float, default=2.0, help='seconds to stay idle')
+    parser.add_argument('--presses', type=int, default=200)
+    args = parser.parse_args()
+
+    for name, section_cls in [('busy polling', BusyPollingSection), ('blocking', IdleSection)]:
+        idle_cpu, latencies = measure(section_cls, args.idle, args.presses)
+        latencies_us = sorted(latency * 1e6 for latency in latencies)
+        print(f"{name}:")
+        print(f"  idle CPU:        {idle_cpu:8.1f} %")
+        print(f"  latency p50:     {statistics.median(latencies_us):8.1f} us")
+        print(f"  latency p99:     {latencies_us[int(len(latencies_us) * 0.99) - 1]:8.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Measurement of the peak memory of generating a maze, against the nested lists of legacy callers
+
+A maze is generated with maze.generate, without and with validation, each in a fresh process whose peak resident
+memory is compared to the one it had before generating. Tracing allocations instead would slow generation down
+tenfold. The peak is reported per cell so that it can be extrapolated to larger mazes, and the nested lists are
+measured on one row and extrapolated. Run with `python -m benchmarks.maze_memory --size 2000` (Unix only).
+"""
+import multiprocessing
+import random
+import resource
+import sys
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+
+from src.util import maze
+
+
+def peak_memory() -> int:
+    """The peak resident memory of this process in bytes"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def measure_generate(size: int, seed: int, validate: bool) -> tuple[float, int, int]:
+    """Generate a maze, returns the seconds taken, the growth of the peak memory and the size of the maze's bits"""
+    before = peak_memory()
+    start = time.perf_counter()
+    maze_matrix = maze.generate(size, size, validate=validate, rng=random.Random(seed))
+    seconds = time.perf_counter() - start
+    return seconds, peak_memory() - before, len(maze_matrix.bits)
+
+
+def main() -> None:
+    """Run the measurement"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=2000, help='width and height of the maze')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    size = args.size
+    cells = size * size
+
+    print(f"{size}x{size} maze")
+    for validate in (False, True):
+        # A process of its own for every measurement, so that the peak of one does not hide the other
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            seconds, peak, maze_bytes = executor.submit(measure_generate, size, args.seed, validate).result()
+        label = 'generate, validated:' if validate else 'generate:'
+        print(f"  {label:24}{peak / 2 ** 20:10.1f} MiB peak, {peak / cells:5.2f} bytes per cell, {seconds:6.1f} s")
+    print(f"  {'finished maze:':24}{maze_bytes / 2 ** 20:10.1f} MiB")
+
+    # Every row of the nested lists holds a pointer per cell to the shared True or False
+    row = [False] * size
+    list_bytes = sys.getsizeof(row) * size + sys.getsizeof([None] * size)
+    print(f"  {'nested lists (approx.):':24}{list_bytes / 2 ** 20:10.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Benchmark of solving generated mazes and of the next direction lookups
+
+Run with `python -m benchmarks.maze_solver --sizes 1000 5000`.
+"""
+import random
+import time
+from argparse import ArgumentParser
+
+from src.util import maze, solver
+
+
+def main() -> None:
+    """Run the benchmark"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--lookups', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    for size in args.sizes:
+        start = time.perf_counter()
+        maze_matrix = maze.generate(size, size, validate=False)
+        generate_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        field = solver.distance_field(maze_matrix)
+        solve_time = time.perf_counter() - start
+
+        cells = [(random.randrange(size), random.randrange(size)) for _ in range(args.lookups)]
+        start = time.perf_counter()
+        for x, y in cells:
+            field.next_direction(x, y)
+        lookup_time = (time.perf_counter() - start) / args.lookups
+
+        print(f"{size:5d}x{size:<5d} generate {generate_time:7.2f} s, solve {solve_time:7.2f} s"
+              f" (path of {field.distance(*field.entrance)}), next direction {lookup_time * 1e9:6.0f} ns")
+
+
+if __name__ == '__main__':
+    main()
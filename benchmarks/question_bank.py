@@ -0,0 +1,65 @@
+"""Benchmark of opening a large question bank, from the JSON file and from the streaming JSON Lines bank
+
+Run with `python -m benchmarks.question_bank`.
+"""
+import json
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.question_store import synthetic_bank
+from src.util import question_bank
+from src.util.question import QuestionStore, get_all_questions
+
+
+def measure(open_store: Callable[[], QuestionStore], draws: int) -> tuple[float, float, int]:
+    """Returns the time to open the store and draw once, the mean time per draw and the peak memory allocated
+
+    Memory is traced while opening and drawing the first question only, tracing slows the timed draws down.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    store = open_store()
+    store.draw()
+    open_time = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(draws):
+        store.draw()
+    draw_time = (time.perf_counter() - start) / draws
+    return open_time, draw_time, peak
+
+
+def main() -> None:
+    """Run the benchmark"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=200_000)
+    parser.add_argument('--draws', type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = Path(directory) / 'questions.json'
+        bank_path = json_path.with_suffix('.jsonl')
+        json_path.write_text(json.dumps([vars(q) for q in synthetic_bank(args.count)]))
+
+        start = time.perf_counter()
+        question_bank.convert(json_path, bank_path)
+        print(f"convert {args.count} questions: {time.perf_counter() - start:.2f} s")
+
+        cases = {
+            'json': lambda: QuestionStore.from_questions(get_all_questions(json_path)),
+            'jsonl': lambda: question_bank.QuestionBank(bank_path).store(),
+        }
+        for name, open_store in cases.items():
+            open_time, draw_time, peak = measure(open_store, args.draws)
+            print(f"{name:6} open + draw {open_time * 1e3:9.1f} ms, draw {draw_time * 1e6:7.2f} us,"
+                  f" peak allocated {peak / 2 ** 20:8.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark of drawing questions from large question banks, with the store and with the old list scanning
+
+Run with `python -m benchmarks.question_store`.
+"""
+import random
+import time
+from argparse import ArgumentParser
+from typing import Callable, Optional
+
+from src.util.question import SPECIAL_PREFIX, Question, QuestionStore
+
+PREFIXES = [None, None, None, 'history-', SPECIAL_PREFIX]
+
+
+def synthetic_bank(count: int) -> list[Question]:
+    """A shuffled question bank spread over a few prefixes"""
+    topics = ['history-', 'science-', 'maths-', SPECIAL_PREFIX]
+    questions = [
+        Question(f"{topics[index % len(topics)]}{index}", f"Question {index}?", ["Yes", "No"], index % 2)
+        for index in range(count)
+    ]
+    random.Random(count).shuffle(questions)
+    return questions
+
+
+class ListPicker:
+    """The list scanning picker the Question section used before the store, kept for comparison"""
+
+    def __init__(self, questions: list[Question]):
+        self.questions_list = list(questions)
+        self.seen_questions = []
+
+    def pick(self, question_prefix: Optional[str]) -> Question:
+        """Pick a question the way the section used to"""
+        if self.questions_list == []:
+            self.questions_list = self.seen_questions
+            self.seen_questions = []
+
+        if question_prefix is not None:
+            chosen_question = random.choice([q for q in self.questions_list if q.id.startswith(question_prefix)])
+        else:
+            chosen_question = random.choice([q for q in self.questions_list if not q.id.startswith(SPECIAL_PREFIX)])
+
+        self.seen_questions.append(chosen_question)
+        self.questions_list.remove(chosen_question)
+        return chosen_question
+
+
+def time_draws(draw: Callable[[Optional[str]], Question], count: int) -> float:
+    """Returns the mean time of count draws cycling through the prefixes, in seconds"""
+    start = time.perf_counter()
+    for index in range(count):
+        draw(PREFIXES[index % len(PREFIXES)])
+    return (time.perf_counter() - start) / count
+
+
+def main() -> None:
+    """Run the benchmark"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--draws', type=int, default=100_000)
+    parser.add_argument('--list-draws', type=int, default=20, help='draws timed with the old picker')
+    args = parser.parse_args()
+
+    random.seed(0)
+    for count in (1_000, 100_000, 1_000_000):
+        questions = synthetic_bank(count)
+
+        start = time.perf_counter()
+        store = QuestionStore.from_questions(questions)
+        build_time = time.perf_counter() - start
+
+        # The first draw of each prefix builds its pool
+        start = time.perf_counter()
+        for prefix in set(PREFIXES):
+            store.draw(prefix)
+        pool_time = time.perf_counter() - start
+
+        store_time = time_draws(store.draw, args.draws)
+        list_time = time_draws(ListPicker(questions).pick, args.list_draws)
+
+        print(f"{count:9d} questions: build {build_time * 1e3:8.1f} ms, pools {pool_time * 1e3:8.1f} ms,"
+              f" draw {store_time * 1e6:7.2f} us, list pick {list_time * 1e6:12.2f} us")
+
+
+if __name__ == '__main__':
+    main()
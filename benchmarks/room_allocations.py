@@ -0,0 +1,56 @@
+"""Measure the memory allocated and the time taken drawing a room and moving entities in the steady state
+
+The test suite checks that no memory is retained (see tests/test_room.py). Run with
+`python -m benchmarks.room_allocations`.
+"""
+import random
+import time
+import tracemalloc
+from argparse import ArgumentParser
+
+from src.GameObjects.assets import ROOM_SIZE
+from src.GameObjects.game_objects import Player, Room
+from src.util.renderer import CellRenderer
+
+
+def step(room: Room, rows: list[list[str]], iterations: int) -> None:
+    """Walk the player back and forth, drawing the room after every move"""
+    for index in range(iterations):
+        room.move_entity("left" if index % 2 else "right", "player")
+        room.draw(rows)
+
+
+def main() -> None:
+    """Run the measurement"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    room = Room("4-way-junction", 0)
+    room.add_entity('player', Player(5, 2))
+    rows = CellRenderer().back_buffer(ROOM_SIZE, ROOM_SIZE)
+
+    # Warm up so that any lazily built tables exist before measuring
+    step(room, rows, 100)
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    step(room, rows, args.iterations)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    step(room, rows, args.iterations)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.iterations} moves with the room drawn")
+    print(f"  retained:  {after - before:8d} bytes")
+    print(f"  peak:      {peak - before:8d} bytes")
+    print(f"  time/step: {elapsed / args.iterations * 1e6:8.2f} us")
+
+
+if __name__ == '__main__':
+    main()
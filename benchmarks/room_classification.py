@@ -0,0 +1,98 @@
+"""Benchmark of classifying every cell of a large maze into a room type and rotation
+
+The side masks of the whole maze are worked out in one pass and looked up in the table of room shapes, as
+World.plan_rooms() does when planning every room of a level, against the matchers run cell by cell on lists of
+neighbours as World used to. The side mask of a single cell, read as a room is entered, is timed too. The per cell
+paths are only timed on some rows, their time for the whole maze is extrapolated. Classification does not depend on
+the maze being solvable, so a random grid stands in for a maze this large. Run with
+`python -m benchmarks.room_classification --size 4000`.
+"""
+import random
+import time
+from argparse import ArgumentParser
+
+from src.GameObjects.game_objects import (
+    ROOM_SHAPES, corner_matcher, dead_end_matcher, four_way_junction_matcher,
+    straight_matcher, three_way_junction_matcher
+)
+from src.util.maze import Maze
+
+MATCHERS = [
+    four_way_junction_matcher,
+    three_way_junction_matcher,
+    corner_matcher,
+    straight_matcher,
+    dead_end_matcher,
+]
+
+
+def random_grid(size: int, seed: int) -> Maze:
+    """A square grid with cells open at random"""
+    return Maze(size, size, random.Random(seed).randbytes((size * size + 7) // 8))
+
+
+def classify_with_matchers(maze_matrix: Maze, rows: range) -> int:
+    """Classify the inner cells of some rows with the matchers, returns the number of rooms found"""
+    rooms = 0
+    for row_index in rows:
+        above, row, below = maze_matrix[row_index - 1], maze_matrix[row_index], maze_matrix[row_index + 1]
+        for column_index in range(1, maze_matrix.width - 1):
+            if not row[column_index]:
+                continue
+            entrances_exits = [
+                bool(above[column_index]),
+                bool(row[column_index + 1]),
+                bool(below[column_index]),
+                bool(row[column_index - 1]),
+            ]
+            for matcher in MATCHERS:
+                if matcher(entrances_exits) is not None:
+                    rooms += 1
+                    break
+    return rooms
+
+
+def classify_with_table(maze_matrix: Maze, rows: range) -> int:
+    """Classify the inner cells of some rows one at a time with the table of room shapes, returns the rooms found"""
+    rooms = 0
+    for row_index in rows:
+        for column_index in range(1, maze_matrix.width - 1):
+            if ROOM_SHAPES[maze_matrix.side_mask(column_index, row_index)] is not None:
+                rooms += 1
+    return rooms
+
+
+def main() -> None:
+    """Run the benchmark"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=4000, help='width and height of the maze')
+    parser.add_argument('--sample-rows', type=int, default=100, help='rows classified, to extrapolate from')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    maze_matrix = random_grid(args.size, args.seed)
+
+    start = time.perf_counter()
+    masks = maze_matrix.side_masks()
+    rooms = sum(masks.count(mask) for mask in range(16) if ROOM_SHAPES[mask] is not None)
+    table_seconds = time.perf_counter() - start
+
+    sample_rows = range(1, min(args.sample_rows, args.size - 2) + 1)
+    scale = (args.size - 2) / len(sample_rows)
+    start = time.perf_counter()
+    classify_with_table(maze_matrix, sample_rows)
+    cell_seconds = (time.perf_counter() - start) * scale
+
+    start = time.perf_counter()
+    classify_with_matchers(maze_matrix, sample_rows)
+    matcher_seconds = (time.perf_counter() - start) * scale
+
+    print(f"{args.size}x{args.size} maze, {rooms} rooms")
+    print(f"  side masks of the maze:     {table_seconds * 1000:10.1f} ms")
+    print(f"  cell by cell (extrapolated):{cell_seconds * 1000:10.1f} ms")
+    print(f"  matchers (extrapolated):    {matcher_seconds * 1000:10.1f} ms")
+    print(f"  speed-up:                   {matcher_seconds / table_seconds:10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark of collision checks and adjacent NPC lookups in crowded rooms
+
+Run with `python -m benchmarks.room_occupancy`.
+"""
+import random
+import time
+from argparse import ArgumentParser
+
+from src.GameObjects.assets import ROOM_SIZE
+from src.GameObjects.game_objects import NPC, Player, Room
+
+DIRECTIONS = ("up", "left", "down", "right")
+
+
+def crowded_room(npc_count: int, rng: random.Random) -> Room:
+    """Builds a room with the player and npc_count NPCs on free cells, picking a template with enough room"""
+    while True:
+        room = Room("dead-end", 0, rng=rng)
+        room.add_entity("player", Player(5, 5))
+        free_cells = [
+            (cell % ROOM_SIZE, cell // ROOM_SIZE)
+            for cell in range(ROOM_SIZE * ROOM_SIZE)
+            if room.passable[cell] and cell not in room.occupancy and cell != 5 * ROOM_SIZE + 5
+        ]
+        if len(free_cells) >= npc_count:
+            break
+
+    for index, (x, y) in enumerate(rng.sample(free_cells, npc_count)):
+        room.add_entity(f"npc{index}", NPC(x, y, rng))
+    return room
+
+
+def main() -> None:
+    """Run the benchmark"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--steps', type=int, default=200_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for npc_count in (1, 10, 50, 70):
+        rng = random.Random(args.seed)
+        room = crowded_room(npc_count, rng)
+        npc_names = [name for name in room.entity_dict if name != "player"]
+        directions = [rng.choice(DIRECTIONS) for _ in range(args.steps)]
+
+        start = time.perf_counter()
+        for direction in directions:
+            room.move_entity(direction, "player")
+            room.scan_for_adjacent_NPC()
+        player_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for index, direction in enumerate(directions):
+            room.move_entity(direction, npc_names[index % len(npc_names)])
+        npc_time = time.perf_counter() - start
+
+        print(f"{len(npc_names):3d} NPCs: player move + scan {player_time / args.steps * 1e6:6.2f} us,"
+              f" NPC move {npc_time / args.steps * 1e6:6.2f} us")
+
+
+if __name__ == '__main__':
+    main()
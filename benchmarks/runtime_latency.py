@@ -0,0 +1,98 @@
+"""Benchmark of the keypress latency of the threaded and asyncio runtimes, from the terminal to run_processing
+
+Keystrokes are typed into a pseudo terminal, so the whole path is measured: reading the keyboard, handing the
+keystroke over to the section loop and processing it. Run with `python -m benchmarks.runtime_latency`.
+"""
+import asyncio
+import codecs
+import os
+import pty
+import statistics
+import threading
+import time
+from argparse import ArgumentParser
+from typing import Callable
+
+from blessed import Terminal
+
+from benchmarks.input_latency import IdleSection
+from src import async_runtime
+from src.async_runtime import AsyncSection
+from src.game import Game
+
+
+class LatencyManager:
+    """Runs a single section recording when each keystroke reaches run_processing"""
+
+    sections: list[IdleSection] = []
+
+    def __init__(self, in_queue: object, terminal: Terminal):
+        self.terminal = terminal
+        self.section = IdleSection(in_queue)
+        LatencyManager.sections.append(self.section)
+
+    def __call__(self):
+        """Run the section on the current thread"""
+        self.section(self.terminal, None)
+
+    async def run_async(self) -> None:
+        """Run the section on the event loop"""
+        await AsyncSection(self.section)(self.terminal, None)
+
+
+def pty_terminal() -> tuple[Terminal, int]:
+    """Returns a terminal reading its keyboard from a pseudo terminal, and the fd to type into"""
+    master, slave = pty.openpty()
+    terminal = Terminal(kind='xterm-256color', stream=open(os.devnull, 'w'), force_styling=True)
+    terminal._keyboard_fd = slave
+    terminal._keyboard_decoder = codecs.getincrementaldecoder('utf8')()
+    return terminal, master
+
+
+def measure(run: Callable[[Terminal], None], presses: int, interval: float) -> list[float]:
+    """Returns the latency of every keypress, in seconds"""
+    terminal, master = pty_terminal()
+    LatencyManager.sections.clear()
+
+    def target() -> None:
+        with terminal.raw():
+            run(terminal)
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    time.sleep(0.2)
+
+    sent_at = []
+    for _ in range(presses):
+        sent_at.append(time.perf_counter())
+        os.write(master, b'x')
+        time.sleep(interval)
+
+    os.write(master, b'q')
+    thread.join()
+    os.close(master)
+    received = LatencyManager.sections[0].received
+    return [received_at - sent for received_at, sent in zip(received, sent_at)]
+
+
+def main() -> None:
+    """Run the benchmark"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--presses', type=int, default=300)
+    parser.add_argument('--interval', type=float, default=0.007, help='seconds between keypresses')
+    args = parser.parse_args()
+
+    runtimes = {
+        'threaded': lambda terminal: Game(LatencyManager).run_threaded(terminal),
+        'asyncio': lambda terminal: asyncio.run(async_runtime.run(LatencyManager, terminal)),
+    }
+    for name, run in runtimes.items():
+        latencies_us = sorted(latency * 1e6 for latency in measure(run, args.presses, args.interval))
+        print(f"{name}:")
+        print(f"  latency p50:     {statistics.median(latencies_us):8.1f} us")
+        print(f"  latency p99:     {latencies_us[int(len(latencies_us) * 0.99) - 1]:8.1f} us")
+        print(f"  latency max:     {latencies_us[-1]:8.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""Load generator for the game server, measuring how many concurrent sessions it sustains at an acceptable latency
+
+The server is started in its own process, so it runs on a single core, and an increasing number of clients connect
+to it. Every client starts a game, finds two open cells next to each other and then walks the player back and forth
+between them at a fixed rate, timing how long the server takes to send back the frame of each keypress. Every move
+of the walk is answered with a frame, so a keypress left unanswered is the server falling behind: it counts as taking
+the whole timeout. Run with `python -m benchmarks.server_load`.
+"""
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+from typing import Optional
+
+UP, DOWN, RIGHT, LEFT = b'\x1b[A', b'\x1b[B', b'\x1b[C', b'\x1b[D'
+# Every move, with the move back
+MOVES = ((LEFT, RIGHT), (RIGHT, LEFT), (UP, DOWN), (DOWN, UP))
+# Moves tried before giving up on finding a walk the server always answers
+FIND_WALK_ATTEMPTS = 8
+
+
+class Client:
+    """A player connected to the server"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.latencies: list[float] = []
+        self.unanswered = 0
+        # The move and the move back the client plays, see find_walk()
+        self.walk: Optional[tuple[bytes, bytes]] = None
+        self._output = asyncio.Event()
+        self._reader_task = asyncio.ensure_future(self._read_output())
+
+    async def _read_output(self) -> None:
+        while await self.reader.read(65536):
+            self._output.set()
+
+    async def _quiet(self, seconds: float) -> None:
+        # Waits until the server sent nothing for some time, so that a late frame is not taken for the next one
+        self._output.clear()
+        while True:
+            try:
+                await asyncio.wait_for(self._output.wait(), seconds)
+            except asyncio.TimeoutError:
+                return
+            self._output.clear()
+
+    async def _press(self, key: bytes, timeout: float) -> Optional[float]:
+        """Press a key, returns the seconds the server took to send a frame back, None if it did not in time"""
+        self._output.clear()
+        sent_at = time.perf_counter()
+        self.writer.write(key)
+        try:
+            await asyncio.wait_for(self._output.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return time.perf_counter() - sent_at
+
+    async def find_walk(self, timeout: float) -> Optional[tuple[bytes, bytes]]:
+        """Find a move and the move back that are both answered, walking the player between two open cells
+
+        A move that is answered but whose move back is not leaves the player on an open cell, from which the moves
+        are tried again. Returns None if no walk was found, e.g. as the server did not answer any move in time.
+        """
+        for _ in range(FIND_WALK_ATTEMPTS):
+            for key, back in MOVES:
+                if await self._press(key, timeout) is None:
+                    continue
+                await self._quiet(0.1)
+                answered = await self._press(back, timeout) is not None
+                await self._quiet(0.1)
+                if answered:
+                    return key, back
+                break
+        return None
+
+    async def start(self, timeout: float) -> None:
+        """Start a game and find the walk to play"""
+        self.writer.write(b'1')
+        await self._quiet(0.5)
+        self.walk = await self.find_walk(timeout)
+
+    async def play(self, until: float, interval: float, timeout: float) -> None:
+        """Walk until the given time, one keypress every interval seconds"""
+        if self.walk is None:
+            # Counted as a single keypress left unanswered
+            self.unanswered += 1
+            self.latencies.append(timeout)
+            return
+
+        presses = 0
+        while time.perf_counter() < until:
+            latency = await self._press(self.walk[presses % 2], timeout)
+            presses += 1
+            if latency is None:
+                # The server is too slow to answer in time, a frame it sends later must not be taken for the next one
+                self.unanswered += 1
+                self.latencies.append(timeout)
+                await self._quiet(interval)
+            else:
+                self.latencies.append(latency)
+                await asyncio.sleep(max(0.0, interval - latency))
+
+    async def close(self) -> None:
+        """Disconnect, which ends the game on the server"""
+        self.writer.close()
+        self._reader_task.cancel()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def measure(host: str, port: int, sessions: int, duration: float, interval: float,
+                  timeout: float) -> tuple[list[float], int]:
+    """Play with a number of concurrent sessions, returns the latency of every keypress and the number unanswered
+
+    The keypresses left unanswered count as taking the whole timeout.
+    """
+    clients = []
+    for _ in range(sessions):
+        clients.append(Client(*await asyncio.open_connection(host, port)))
+
+    # Finding the walks may take a few unanswered moves, so it is not part of the time measured
+    await asyncio.gather(*(client.start(timeout) for client in clients))
+    until = time.perf_counter() + duration
+    await asyncio.gather(*(client.play(until, interval, timeout) for client in clients))
+    for client in clients:
+        await client.close()
+    # Let the server end the games before the next level of load
+    await asyncio.sleep(0.5)
+
+    latencies = [latency for client in clients for latency in client.latencies]
+    return latencies, sum(client.unanswered for client in clients)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """The value below which a fraction of the sorted values fall"""
+    return values[max(int(len(values) * fraction) - 1, 0)]
+
+
+async def wait_for_server(host: str, port: int, timeout: float = 10.0) -> None:
+    """Wait until the server accepts connections"""
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+        else:
+            writer.close()
+            return
+
+
+async def run(args: object) -> Optional[int]:
+    """Measure every level of load, returns the most sessions served with a p99 latency under the threshold"""
+    await wait_for_server(args.host, args.port)
+    sustained = None
+    for sessions in args.sessions:
+        latencies, unanswered = await measure(args.host, args.port, sessions, args.duration, args.interval,
+                                              args.timeout)
+        if unanswered == len(latencies):
+            print(f"{sessions:5d} sessions: no keypress answered")
+            break
+
+        latencies_ms = sorted(latency * 1e3 for latency in latencies)
+        p99 = percentile(latencies_ms, 0.99)
+        print(
+            f"{sessions:5d} sessions: p50 {statistics.median(latencies_ms):7.1f} ms   p99 {p99:7.1f} ms   "
+            f"answered {len(latencies_ms) - unanswered:6d}   unanswered {unanswered:5d}"
+        )
+        if p99 > args.threshold:
+            break
+        sustained = sessions
+    return sustained
+
+
+def main() -> None:
+    """Run the benchmark"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=2424)
+    parser.add_argument('--sessions', type=int, nargs='+', default=[10, 25, 50, 100, 200, 400, 800],
+                        help='numbers of concurrent sessions to measure, in increasing order')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds of play at every level of load')
+    parser.add_argument('--interval', type=float, default=0.1, help='seconds between the keypresses of a client')
+    parser.add_argument('--timeout', type=float, default=1.0, help='seconds to wait for the frame of a keypress')
+    parser.add_argument('--threshold', type=float, default=50.0, help='acceptable p99 latency, in milliseconds')
+    args = parser.parse_args()
+
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'src.server', '--host', args.host, '--port', str(args.port)],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        sustained = asyncio.run(run(args))
+    finally:
+        server.terminate()
+        server.wait()
+
+    if sustained is None:
+        print(f"no level of load kept the p99 latency under {args.threshold:.0f} ms")
+    else:
+        print(f"sustained {sustained} sessions with a p99 latency under {args.threshold:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
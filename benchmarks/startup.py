@@ -0,0 +1,120 @@
+"""Benchmark of the startup of the game: time to the first frame of the menu, and import time per module
+
+Every measurement runs in a fresh interpreter, since imports are only paid once per process. The time to the first
+menu frame is measured from starting the process to the menu writing its first frame to a virtual terminal. It is
+measured with the sections built lazily as the game does, without the background warm up, and with every section
+built up front as the game used to. Run with `python -m benchmarks.startup`.
+"""
+import re
+import statistics
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+from src.manager import SECTIONS
+
+ROOT = Path(__file__).parent.parent
+
+# Runs the game up to the first frame of the menu, then writes a line to stdout and exits
+CHILD = """
+import os
+import queue
+
+import main
+from src.headless import VirtualTerminal
+from src.manager import SECTIONS, GameManager
+
+
+class MenuWatch:
+    encoding = 'utf8'
+
+    def write(self, text):
+        if '4. Quit' in text:
+            os.write(1, b'menu\\n')
+            os._exit(0)
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+in_queue = queue.Queue()
+terminal = VirtualTerminal(80, 24, MenuWatch())
+manager = GameManager(in_queue, terminal, warm_up={warm_up})
+if {eager}:
+    for name in SECTIONS:
+        manager.section(name)
+# Any key gets past the bootstrap section
+in_queue.put(terminal.keystroke(' '))
+manager()
+"""
+
+MODES = {
+    'lazy, warm up': {'warm_up': True, 'eager': False},
+    'lazy': {'warm_up': False, 'eager': False},
+    'eager': {'warm_up': False, 'eager': True},
+}
+
+IMPORT_TIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)')
+
+
+def time_to_line(code: str) -> float:
+    """Seconds from starting a python process running code to it writing its first line"""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', code], cwd=ROOT, stdout=subprocess.PIPE)
+    process.stdout.readline()
+    elapsed = time.perf_counter() - start
+    process.wait()
+    return elapsed
+
+
+def import_times(code: str) -> dict[str, tuple[int, int, int]]:
+    """The self and cumulative import time in microseconds and the depth of every module code imports"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for match in IMPORT_TIME.finditer(result.stderr):
+        self_us, cumulative_us, indent, name = match.groups()
+        times[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return times
+
+
+def fastest_import_times(code: str, repeat: int) -> dict[str, tuple[int, int, int]]:
+    """import_times() over several runs, keeping the fastest time of every module"""
+    runs = [import_times(code) for _ in range(repeat)]
+    return {name: min(run[name] for run in runs if name in run) for name in runs[0]}
+
+
+def main() -> None:
+    """Run the benchmark"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10, help='processes started per measurement')
+    parser.add_argument('--top', type=int, default=12, help='number of slowest modules to list')
+    args = parser.parse_args()
+
+    interpreter = [time_to_line("import os; os.write(1, b'\\n')") for _ in range(args.repeat)]
+    print(f"time to first menu frame, median of {args.repeat} processes")
+    print(f"  {'bare interpreter':24} {statistics.median(interpreter) * 1e3:8.1f} ms")
+    for mode, options in MODES.items():
+        times = [time_to_line(CHILD.format(**options)) for _ in range(args.repeat)]
+        print(f"  {mode:24} {statistics.median(times) * 1e3:8.1f} ms")
+
+    times = fastest_import_times('import main', args.repeat)
+    print(f"\nimport main: {times['main'][1] / 1e3:.1f} ms, slowest modules by cumulative time")
+    slowest = sorted(times.items(), key=lambda item: item[1][1], reverse=True)[1:args.top + 1]
+    for name, (self_us, cumulative_us, depth) in slowest:
+        print(f"  {'  ' * depth + name:40} {self_us / 1e3:8.1f} ms self {cumulative_us / 1e3:8.1f} ms cumulative")
+
+    modules = [module_name for module_name, _ in SECTIONS.values()]
+    times = fastest_import_times('import main; ' + '; '.join(f'import {name}' for name in modules), args.repeat)
+    print("\nsection modules, imported once the menu is up")
+    for name in modules:
+        _, cumulative_us, _ = times.get(name, (0, 0, 0))
+        print(f"  {name:40} {cumulative_us / 1e3:8.1f} ms cumulative")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""Benchmark suite covering the hot paths of the game
+
+Every case is seeded so that runs are reproducible. Results are written as JSON and can be compared against a stored
+baseline to flag regressions:
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --compare baseline.json --threshold 0.2
+"""
+import json
+import platform
+import queue
+import random
+import sys
+import time
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from src.GameObjects.assets import ROOM_SIZE
+from src.GameObjects.game_objects import Player, Room, World
+from src.headless import VirtualTerminal
+from src.sections.over_world import OverWorld, StartOverWorld
+from src.sections.question import Question
+from src.util import maze, question, solver
+from src.util.renderer import CellRenderer
+
+SEED = 1234
+
+
+@dataclass
+class Case:
+    """A single benchmark: setup builds the state, and the returned callable is what gets timed"""
+
+    name: str
+    setup: Callable[[], Callable[[], None]]
+    number: int = 1
+
+
+def maze_generate(size: int) -> Callable[[], None]:
+    """Generate a square maze"""
+    return lambda: maze.generate(size, size)
+
+
+def maze_solve(size: int) -> Callable[[], None]:
+    """Build the distance field of a square maze"""
+    maze_matrix = maze.generate(size, size, validate=False)
+    return lambda: solver.distance_field(maze_matrix)
+
+
+def world_init(size: int) -> Callable[[], None]:
+    """Build a World (and its lazy room matrix) for a square maze"""
+    maze_matrix = maze.generate(size, size)
+    return lambda: World(maze_matrix)
+
+
+def world_plan_rooms(size: int) -> Callable[[], None]:
+    """Plan every room of a World, as generating a level does"""
+    world = World(maze.generate(size, size))
+    return world.plan_rooms
+
+
+def world_materialise(size: int) -> Callable[[], None]:
+    """Build a World and every one of its rooms"""
+    maze_matrix = maze.generate(size, size)
+
+    def run() -> None:
+        world = World(maze_matrix, cache_size=size * size)
+        for row_index in range(size):
+            for column_index in range(size):
+                world.world_matrix.room(row_index, column_index)
+    return run
+
+
+def room_init() -> Callable[[], None]:
+    """Build a single room"""
+    return lambda: Room("3-way-junction", 90)
+
+
+def room_render(full_repaint: bool) -> Callable[[], None]:
+    """Draw a room with a moving player and render it to a null sink, repainting every cell or only the changed ones"""
+    terminal = VirtualTerminal()
+    renderer = CellRenderer()
+    room = Room("4-way-junction", 0)
+    room.add_entity("player", Player(5, 5))
+    directions = ["left", "right"]
+    step = 0
+
+    def run() -> None:
+        nonlocal step
+        step += 1
+        room.move_entity(directions[step % 2], "player")
+        if full_repaint:
+            renderer.invalidate()
+        rows = renderer.back_buffer(ROOM_SIZE, ROOM_SIZE)
+        room.draw(rows)
+        renderer.render(terminal, terminal.stream.write, rows, room)
+    return run
+
+
+def over_world_moves() -> Callable[[], None]:
+    """Process a player move in the over world"""
+    terminal = VirtualTerminal()
+    section = OverWorld(queue.Queue())
+    section.handle_start(StartOverWorld('😎', True))
+    keys = [terminal.keystroke(key) for key in ('KEY_LEFT', 'KEY_DOWN', 'KEY_RIGHT', 'KEY_UP')]
+    step = 0
+
+    def run() -> None:
+        nonlocal step
+        step += 1
+        section.run_processing(keys[step % 4])
+        section._running = True
+    return run
+
+
+def synthetic_questions(count: int) -> list[question.Question]:
+    """A question bank of count questions, one in ten of them special"""
+    return [
+        question.Question(
+            f"special-{index}" if index % 10 == 0 else f"bench-{index}",
+            f"Question number {index}?",
+            ["Yes", "No", "Maybe"],
+            index % 3,
+        )
+        for index in range(count)
+    ]
+
+
+def question_pick(count: int) -> Callable[[], None]:
+    """Pick a question from a bank of count questions"""
+    section = Question(queue.Queue())
+    section.store = question.QuestionStore.from_questions(synthetic_questions(count))
+    prefixes = [None, None, None, 'special-']
+    step = 0
+    # Pools are built on the first draw of each prefix, keep that out of the timing
+    for prefix in set(prefixes):
+        section._pick_question(prefix)
+
+    def run() -> None:
+        nonlocal step
+        step += 1
+        section._pick_question(prefixes[step % 4])
+    return run
+
+
+CASES = [
+    *[Case(f"maze.generate[{size}]", lambda size=size: maze_generate(size)) for size in (50, 200, 500)],
+    *[Case(f"solver.distance_field[{size}]", lambda size=size: maze_solve(size)) for size in (50, 200, 500)],
+    *[Case(f"World.__init__[{size}]", lambda size=size: world_init(size), 100) for size in (50, 200)],
+    *[Case(f"World.plan_rooms[{size}]", lambda size=size: world_plan_rooms(size)) for size in (15, 200)],
+    Case("World.materialise[20]", lambda: world_materialise(20)),
+    Case("Room.__init__", room_init, 1000),
+    Case("Room.render[full]", lambda: room_render(True), 1000),
+    Case("Room.render[diff]", lambda: room_render(False), 1000),
+    Case("OverWorld.run_processing", over_world_moves, 10000),
+    *[Case(f"Question._pick_question[{count}]", lambda count=count: question_pick(count), 100)
+      for count in (100, 1000, 10000, 1000000)],
+]
+
+
+def measure(case: Case, repeat: int) -> float:
+    """Returns the best time per call of a case, in seconds"""
+    random.seed(SEED)
+    run = case.setup()
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(case.number):
+            run()
+        best = min(best, (time.perf_counter() - start) / case.number)
+    return best
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """Returns the names of the cases that got slower than the baseline by more than threshold"""
+    return [
+        name for name, seconds in results.items()
+        if name in baseline and seconds > baseline[name] * (1 + threshold)
+    ]
+
+
+def main() -> None:
+    """Run the benchmark suite"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', type=Path, default=None, help='file to write the results to')
+    parser.add_argument('--compare', type=Path, default=None, help='baseline results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slow down before flagging, 0.2 = 20%%')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--filter', default='', help='only run the cases whose name contains this')
+    args = parser.parse_args()
+
+    baseline: Optional[dict[str, float]] = None
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())['results']
+
+    results = {}
+    for case in CASES:
+        if args.filter not in case.name:
+            continue
+
+        results[case.name] = measure(case, args.repeat)
+        line = f"{case.name:36} {results[case.name] * 1e6:14.2f} us"
+        if baseline is not None and case.name in baseline:
+            line += f"  {results[case.name] / baseline[case.name]:6.2f}x baseline"
+        print(line)
+
+    if args.output is not None:
+        args.output.write_text(json.dumps({
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': SEED,
+            'results': results,
+        }, indent=2))
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for name in regressions:
+            print(f"REGRESSION: {name} is {results[name] / baseline[name]:.2f}x slower than the baseline")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
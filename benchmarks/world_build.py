@@ -0,0 +1,80 @@
+"""Benchmark of World construction with and without the shared asset registry
+
+Run with `python -m benchmarks.world_build`.
+"""
+import random
+import time
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from src.GameObjects import assets, game_objects
+from src.GameObjects.game_objects import World
+from src.util import maze
+
+
+@contextmanager
+def uncached_assets() -> Iterator[None]:
+    """Re-read the asset files and rebuild the layout and tiles on every lookup, the way rooms did before the registry
+
+    The shared layouts and tiles are cached functions of their own, so their caches are bypassed along with the one
+    of the asset files: otherwise the asset files would only be read once per template and rotation.
+    """
+    def reload_room_templates(file_path: Path = assets.ROOM_TEMPLATES_PATH) -> object:
+        return assets._load_room_templates.__wrapped__(file_path)
+
+    def reload_object_representation(file_path: Path = assets.OBJECT_REPRESENTATION_PATH) -> object:
+        return assets._load_object_representation.__wrapped__(file_path)
+
+    shared = {name: getattr(game_objects, name) for name in ('room_layout', 'tiles', '_tile_table')}
+    game_objects.get_room_templates = reload_room_templates
+    game_objects.get_object_representation = reload_object_representation
+    for name, cached in shared.items():
+        setattr(game_objects, name, cached.__wrapped__)
+    try:
+        yield
+    finally:
+        game_objects.get_room_templates = assets.get_room_templates
+        game_objects.get_object_representation = assets.get_object_representation
+        for name, cached in shared.items():
+            setattr(game_objects, name, cached)
+
+
+def time_world(maze_matrix: list[list[bool]], repeat: int) -> float:
+    """Returns the best time out of `repeat` World constructions with every room materialised"""
+    length, width = len(maze_matrix), len(maze_matrix[0])
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        world = World(maze_matrix, cache_size=length * width)
+        for row_index in range(length):
+            for column_index in range(width):
+                world.world_matrix.room(row_index, column_index)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    maze_matrix = maze.generate(args.size, args.size)
+
+    with uncached_assets():
+        before = time_world(maze_matrix, args.repeat)
+    after = time_world(maze_matrix, args.repeat)
+
+    print(f"World {args.size}x{args.size}")
+    print(f"  re-reading assets: {before * 1000:10.1f} ms")
+    print(f"  shared registry:   {after * 1000:10.1f} ms")
+    print(f"  speed-up:          {before / after:10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
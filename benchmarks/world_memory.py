@@ -0,0 +1,77 @@
+"""Measurement of the memory taken by the rooms of a world, with every room materialised
+
+The bytes per room are traced with tracemalloc on a sample of rooms, then every room of a large world is built to
+report the resident set size of the whole process. Run with `python -m benchmarks.world_memory --size 1000`.
+"""
+import gc
+import random
+import resource
+import time
+import tracemalloc
+from argparse import ArgumentParser
+
+from src.GameObjects.game_objects import Room, World
+from src.util import maze
+
+
+def rss_bytes() -> int:
+    """The current resident set size of the process, or the peak one where the current one is not available"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def materialise(world: World, rows: range) -> int:
+    """Build every room of some rows of a world, returns the number of rooms built"""
+    width = world.maze_data["width"]
+    count = 0
+    for row_index in rows:
+        for column_index in range(width):
+            if isinstance(world.world_matrix.room(row_index, column_index), Room):
+                count += 1
+    return count
+
+
+def main() -> None:
+    """Run the measurement"""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=1000, help='width and height of the maze')
+    parser.add_argument('--sample-rows', type=int, default=20, help='rows of rooms traced with tracemalloc')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    maze_matrix = maze.generate(args.size, args.size)
+
+    # Bytes per room, traced on the first rows once the shared assets and tables are loaded
+    world = World(maze_matrix, args.seed, cache_size=args.size * args.size)
+    materialise(world, range(1))
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    sampled = materialise(world, range(1, 1 + args.sample_rows))
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del world
+    gc.collect()
+
+    # Resident set size with every room of the world in memory
+    rss_before = rss_bytes()
+    world = World(maze_matrix, args.seed, cache_size=args.size * args.size)
+    start = time.perf_counter()
+    rooms = materialise(world, range(args.size))
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    rss_after = rss_bytes()
+
+    print(f"{args.size}x{args.size} world, {rooms} rooms built in {elapsed:.1f} s")
+    print(f"  bytes per room (traced):   {(after - before) / sampled:10.0f}")
+    print(f"  bytes per room (rss):      {(rss_after - rss_before) / rooms:10.0f}")
+    print(f"  rss with every room:       {rss_after / 2 ** 20:10.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,27 +1,43 @@
 from argparse import ArgumentParser
 
-from src.dummy_manager import (
-    DummyGameOverManager, DummyMenuManager, DummyOverWorldManager,
-    DummyQuestionManager
-)
-from src.game import Game
+from src.game import RUNTIMES, Game
 from src.manager import GameManager
 
 
 def main() -> None:
     """Run the game"""
     parser = ArgumentParser()
-    parser.set_defaults(manager=GameManager)
+    parser.set_defaults(manager=None)
 
     group = parser.add_mutually_exclusive_group(required=False)
-    group.add_argument('--menu', dest='manager', action='store_const', const=DummyMenuManager)
-    group.add_argument('--over_world', dest='manager', action='store_const', const=DummyOverWorldManager)
-    group.add_argument('--question', dest='manager', action='store_const', const=DummyQuestionManager)
-    group.add_argument('--game_over', dest='manager', action='store_const', const=DummyGameOverManager)
+    group.add_argument('--menu', dest='manager', action='store_const', const='DummyMenuManager')
+    group.add_argument('--over_world', dest='manager', action='store_const', const='DummyOverWorldManager')
+    group.add_argument('--question', dest='manager', action='store_const', const='DummyQuestionManager')
+    group.add_argument('--game_over', dest='manager', action='store_const', const='DummyGameOverManager')
 
-    args = parser.parse_args()
+    parser.add_argument(
+        '--metrics', dest='metrics_path', default=None, help='file to dump the frame metrics to on exit'
+    )
+
+    parser.add_argument(
+        '--runtime', choices=RUNTIMES, default='threaded', help='run the sections on a thread or on an asyncio loop'
+    )
 
-    game = Game(args.manager)
+    parser.add_argument(
+        '--record', dest='record_path', default=None, help='file to record the game to, see src.replay'
+    )
+
+    args = parser.parse_args()
+    if args.manager is None:
+        manager_cls = GameManager
+    else:
+        if args.record_path is not None:
+            parser.error('only the full game can be recorded')
+        # The dummy managers import every section up front, so they are only imported when asked for
+        from src import dummy_manager
+        manager_cls = getattr(dummy_manager, args.manager)
+
+    game = Game(manager_cls, args.metrics_path, args.runtime, args.record_path)
     game.run()
 
 
@@ -0,0 +1,38 @@
+import os
+import random
+import time
+from argparse import ArgumentParser
+from multiprocessing import Pool
+from pathlib import Path
+
+from src.util.level_pack import (
+    LEVEL_PACK_PATH, generate_record, level_seed, write_pack
+)
+
+
+def main() -> None:
+    """Generate a pack of levels using every core"""
+    parser = ArgumentParser(description='Generate a level pack for the game ahead of time')
+    parser.add_argument('output', type=Path, nargs='?', default=LEVEL_PACK_PATH)
+    parser.add_argument('--count', type=int, default=32, help='number of levels in the pack')
+    parser.add_argument('--width', type=int, default=15, help='maze width of every level')
+    parser.add_argument('--height', type=int, default=15, help='maze height of every level')
+    parser.add_argument('--seed', type=int, default=None, help='master seed, the same seed gives the same pack')
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    master_seed = random.getrandbits(64) if args.seed is None else args.seed
+    tasks = [(level_seed(master_seed, index), args.width, args.height) for index in range(args.count)]
+
+    start = time.perf_counter()
+    with Pool(args.processes) as pool:
+        # starmap keeps the order of the levels, whichever process generated them
+        records = pool.starmap(generate_record, tasks, chunksize=1)
+    write_pack(args.output, master_seed, records)
+
+    print(f"wrote {args.count} levels to {args.output} with master seed {master_seed}"
+          f" in {time.perf_counter() - start:.2f} s ({args.output.stat().st_size} bytes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Process-wide registry for the JSON assets shared by every room, tile and entity
+
+The room templates and the object representations are read, validated and frozen once per file.
+Every caller gets the same read-only view back, so building a world costs no extra file access per room.
+"""
+import json
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+ASSET_DIRECTORY = Path(__file__).parent
+ROOM_TEMPLATES_PATH = ASSET_DIRECTORY / 'room_templates.json'
+OBJECT_REPRESENTATION_PATH = ASSET_DIRECTORY / 'object_representation.json'
+
+ROOM_SIZE = 11
+ROOM_TYPES = ("dead-end", "straight", "corner", "3-way-junction", "4-way-junction")
+TEMPLATE_SYMBOLS = frozenset("# /|")
+OBJECT_REPRESENTATION_KEYS = ("Wall", "Space", "Door", "Player", "NPC")
+
+
+class RoomTemplate(NamedTuple):
+    """A single named room layout, stored as a tuple of rows of template symbols"""
+
+    name: str
+    layout: tuple[tuple[str, ...], ...]
+
+
+def _validate_layout(room_type: str, name: str, layout: list) -> tuple[tuple[str, ...], ...]:
+    if len(layout) != ROOM_SIZE or any(len(row) != ROOM_SIZE for row in layout):
+        raise ValueError(f"Room template '{room_type}/{name}' must be {ROOM_SIZE}x{ROOM_SIZE}")
+
+    unknown = {symbol for row in layout for symbol in row} - TEMPLATE_SYMBOLS
+    if unknown:
+        raise ValueError(f"Room template '{room_type}/{name}' uses unknown symbols {sorted(unknown)}")
+
+    return tuple(tuple(row) for row in layout)
+
+
+@lru_cache(maxsize=None)
+def get_room_templates(file_path: Path = ROOM_TEMPLATES_PATH) -> Mapping[str, tuple[RoomTemplate, ...]]:
+    """Returns the validated room templates of every room type, loading the file on first use only"""
+    return _load_room_templates(Path(file_path).resolve())
+
+
+@lru_cache(maxsize=None)
+def get_object_representation(file_path: Path = OBJECT_REPRESENTATION_PATH) -> Mapping[str, object]:
+    """Returns the validated object representations, loading the file on first use only"""
+    return _load_object_representation(Path(file_path).resolve())
+
+
+def clear_cache() -> None:
+    """Forget every loaded asset so that the next lookup reads the files again"""
+    get_room_templates.cache_clear()
+    get_object_representation.cache_clear()
+    _load_room_templates.cache_clear()
+    _load_object_representation.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _load_room_templates(file_path: Path) -> Mapping[str, tuple[RoomTemplate, ...]]:
+    with file_path.open('r', encoding='utf8') as room_templates_file:
+        contents = json.load(room_templates_file)
+
+    templates = {}
+    for room_type in ROOM_TYPES:
+        if not contents.get(room_type):
+            raise ValueError(f"Room templates file has no templates for '{room_type}'")
+
+        templates[room_type] = tuple(
+            RoomTemplate(template["name"], _validate_layout(room_type, template["name"], template["layout"]))
+            for template in contents[room_type]
+        )
+
+    return MappingProxyType(templates)
+
+
+@lru_cache(maxsize=None)
+def _load_object_representation(file_path: Path) -> Mapping[str, object]:
+    with file_path.open('r', encoding='utf8') as object_representation_file:
+        contents = json.load(object_representation_file)
+
+    missing = [key for key in OBJECT_REPRESENTATION_KEYS if key not in contents]
+    if missing:
+        raise ValueError(f"Object representation file is missing {missing}")
+    if len(contents["Door"]) != 2:
+        raise ValueError("Door must have exactly two representations (unlocked, locked)")
+    if not contents["NPC"]:
+        raise ValueError("At least one NPC representation is required")
+
+    return MappingProxyType({
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in contents.items()
+    })
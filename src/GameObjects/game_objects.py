@@ -1,11 +1,58 @@
 """Includes all object classes that appear in-game"""
-import json
 import random
-from copy import deepcopy
+from collections import OrderedDict
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Callable, Optional
+from types import MappingProxyType, ModuleType
+from typing import Mapping, NamedTuple, Optional, Union
+
+from src.GameObjects.assets import (
+    ROOM_SIZE, ROOM_TEMPLATES_PATH, get_object_representation,
+    get_room_templates
+)
+from src.util import solver
+from src.util.chunks import ChunkedMaze
+from src.util.maze import DOWN, LEFT, RIGHT, UP, Maze
+
+# Tile ids stored in the room grids
+SPACE, WALL, DOOR, LOCKED_DOOR = range(4)
+TILE_IDS = {" ": SPACE, "#": WALL, "/": DOOR, "|": LOCKED_DOOR}
+
+_TRANSLATIONS = {"up": (0, -1), "left": (-1, 0), "down": (0, 1), "right": (1, 0)}
+# Order in which neighbours are scanned for NPCs: below, right, above, left
+_ADJACENT_TRANSLATIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+# Cells just inside the doors where the NPC of a room may stand
+NPC_PLACEMENTS = ((5, 1), (9, 5), (5, 9), (1, 5))
+
+
+class RoomChoices(NamedTuple):
+    """The choices made at random when a room is built, as indexes into the templates and representations"""
+
+    template: int
+    npc_placement: int
+    npc_representation: int
+
+    @classmethod
+    def draw(
+            cls,
+            room_type: str,
+            rng: Union[random.Random, ModuleType],
+            room_templates_filepath: Path = ROOM_TEMPLATES_PATH,
+    ) -> 'RoomChoices':
+        """Make the choices for a room of a type"""
+        return cls(
+            rng.randrange(len(get_room_templates(room_templates_filepath)[room_type])),
+            rng.randrange(len(NPC_PLACEMENTS)),
+            rng.randrange(len(get_object_representation()["NPC"])),
+        )
+
 
-from blessed import Terminal
+class RoomPlan(NamedTuple):
+    """Everything needed to build a room exactly as it was first generated"""
+
+    room_type: str
+    rotation: int
+    choices: RoomChoices
 
 
 def four_way_junction_matcher(entrances_exits: list[bool]) -> Optional[dict]:
@@ -85,104 +132,324 @@ def dead_end_matcher(entrances_exits: list[bool]) -> Optional[dict]:
         sequence = sequence[-1:] + sequence[:-1]
 
 
+def _run_matchers(entrances_exits: list[bool]) -> Optional[dict]:
+    """Returns the room type and rotation found by the first matcher that matches, None if none match"""
+    matchers = [
+        four_way_junction_matcher,
+        three_way_junction_matcher,
+        corner_matcher,
+        straight_matcher,
+        dead_end_matcher
+    ]
+    for matcher in matchers:
+        result = matcher(entrances_exits)
+        if result is not None:
+            return result
+
+    return None
+
+
+# Bits of the side mask of a cell (see src.util.maze), in the order the matchers take the sides in
+_SIDES = (UP, RIGHT, DOWN, LEFT)
+
+# The room type and rotation for every side mask, worked out once by the matchers. The entries are shared by every
+# cell with the same open sides, so they are read only.
+ROOM_SHAPES: tuple[Optional[Mapping], ...] = tuple(
+    None if shape is None else MappingProxyType(shape)
+    for shape in (_run_matchers([bool(mask & side) for side in _SIDES]) for mask in range(16))
+)
+
+
 # World Data class
 class World:
-    """Container for world/level - contains all rooms initialised"""
+    """Container for world/level - rooms are built when first entered and kept in a bounded cache"""
 
-    def __init__(self, maze_matrix: list[list[bool]]):
-        self.raw_matrix = maze_matrix
-        # Find entrance (bottom) exit (top)
-        self.maze_data = {
-            "length": len(self.raw_matrix),
-            "width": len(self.raw_matrix[0]),
-            "entrance_index": self.raw_matrix[0].index(True),
-            "exit_index": self.raw_matrix[-1].index(True)
-        }
+    def __init__(
+            self,
+            maze_matrix: Union[Maze, ChunkedMaze, list[list[bool]]],
+            seed: Optional[int] = None,
+            cache_size: int = 16,
+            room_plans: Optional[Mapping[tuple[int, int], RoomPlan]] = None,
+    ):
+        # Nested list matrices of legacy callers are packed once, the world reads the maze bit by bit
+        self.raw_matrix = Maze.from_list(maze_matrix) if isinstance(maze_matrix, list) else maze_matrix
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.cache_size = cache_size
+        # Plans of the rooms made ahead of time (e.g. from a level pack), the others are planned from the seed
+        self.room_plans = room_plans
+        self.maze_data = self.measure_maze()
         self.world_matrix = self.convert_matrix()
+        self.player = Player(5, 2)
+        self.active_room = None
         self.update_world_location(0, self.maze_data["entrance_index"])
-        self.active_room.add_entity('player', Player(5, 2))
-        self.active_room.entity_dict['player'].update_location(5, 2)
+
+    def close(self) -> None:
+        """Release anything the world holds on to besides memory, nothing for a world of a single maze"""
+        pass
+
+    def measure_maze(self) -> dict:
+        """Returns the size of the maze and the columns of its entrance and exit"""
+        # Find entrance (bottom) exit (top)
+        return {
+            "length": self.raw_matrix.height,
+            "width": self.raw_matrix.width,
+            "entrance_index": self.raw_matrix.entrance_index,
+            "exit_index": self.raw_matrix.exit_index
+        }
 
     def set_character(self, character: str) -> None:
         """Call to set the character string of the character"""
-        self.active_room.entity_dict['player'].representation = character
+        self.player.representation = character
 
     def reset_to_start(self) -> None:
         """Call to reset the character and world to the start of the maze"""
+        self.player.update_location(5, 2)
         self.update_world_location(0, self.maze_data["entrance_index"])
-        self.active_room.entity_dict['player'].update_location(5, 2)
 
     @property
     def completed(self) -> bool:
         """Indicates whether the world has been successfully completed or not"""
         return self.world_location[0] == self.maze_data['length'] - 1
 
-    def convert_matrix(self) -> list[list]:
-        """Converts maze_matrix from maze.py to list of rooms"""
-        world_list = []
-        for row_index in range(self.maze_data["length"]):
-            row = []
-            for column_index in range(self.maze_data["width"]):
-                if row_index in [0, self.maze_data["length"] - 1] or column_index in [0, self.maze_data["width"] - 1]:
-                    # print(column_index, row_index, end=":")
-                    # print("Empty")
-                    row.append(Empty())
-                else:
-                    # print(column_index, row_index, end=":")
-                    entrances_exits = [
-                        self.raw_matrix[row_index - 1][column_index],
-                        self.raw_matrix[row_index][column_index + 1],
-                        self.raw_matrix[row_index + 1][column_index],
-                        self.raw_matrix[row_index][column_index - 1]
-                    ]
-                    # print(entrances_exits, end=" - ")
-                    if self.raw_matrix[row_index][column_index]:
-                        matchers = [
-                            four_way_junction_matcher,
-                            three_way_junction_matcher,
-                            corner_matcher,
-                            straight_matcher,
-                            dead_end_matcher
-                        ]
-
-                        for matcher in matchers:
-                            result = matcher(entrances_exits)
-                            if result is not None:
-                                room_parameters = result
-                                break
-
-                        # print("Room:" + str(room_parameters))
-
-                        row.append(Room(
-                            room_parameters["type"],
-                            room_parameters["rotation"],
-                        ))
-                    else:
-                        # print("Empty")
-                        row.append(Empty())
-            world_list.append(row)
-            # print()
-        world_list[0][self.maze_data["entrance_index"]] = Room("dead-end", 180)
-        world_list[-1][self.maze_data["exit_index"]] = Room("dead-end", 0)
-        return world_list
+    @cached_property
+    def distance_field(self) -> solver.DistanceField:
+        """Distance to the exit of every maze cell, solved once per world on first use"""
+        return solver.distance_field(self.raw_matrix)
+
+    def hint(self) -> Optional[str]:
+        """The direction to leave the current room by to get closer to the exit, None in the exit room"""
+        row_index, column_index = self.world_location
+        return self.distance_field.next_direction(column_index, row_index)
+
+    def convert_matrix(self) -> 'WorldMatrix':
+        """Converts maze_matrix from maze.py to a lazily built matrix of rooms"""
+        return WorldMatrix(self, self.cache_size)
+
+    def room_parameters(self, row_index: int, column_index: int) -> Optional[Mapping]:
+        """Returns the room type and rotation at a maze cell, or None if there is no room there"""
+        if row_index == 0 and column_index == self.maze_data["entrance_index"]:
+            return {"type": "dead-end", "rotation": 180}
+        if row_index == self.maze_data["length"] - 1 and column_index == self.maze_data["exit_index"]:
+            return {"type": "dead-end", "rotation": 0}
+        if row_index in [0, self.maze_data["length"] - 1] or column_index in [0, self.maze_data["width"] - 1]:
+            return None
+        return self.match_cell(row_index, column_index)
+
+    def match_cell(self, row_index: int, column_index: int) -> Optional[Mapping]:
+        """Returns the room type and rotation of an inner maze cell from its open neighbours, None for a wall"""
+        return ROOM_SHAPES[self.raw_matrix.side_mask(column_index, row_index)]
+
+    def room_plan(self, row_index: int, column_index: int) -> Optional[RoomPlan]:
+        """Returns the plan of the room at a maze cell, or None if there is no room there
+
+        The template, rotation and NPC only depend on the world seed and the cell, unless the plans were given.
+        """
+        if self.room_plans is not None:
+            return self.room_plans.get((row_index, column_index))
+
+        return self._plan(row_index, column_index, self.room_parameters(row_index, column_index))
+
+    def plan_rooms(self) -> dict[tuple[int, int], RoomPlan]:
+        """Returns the plan of every room of the world, by maze cell
+
+        The cells are classified in one pass over the whole maze (see Maze.side_masks), rather than one at a time as
+        rooms are entered. The plans are the ones room_plan() returns.
+        """
+        if self.room_plans is not None:
+            return dict(self.room_plans)
+
+        length, width = self.maze_data["length"], self.maze_data["width"]
+        # In the order of the cells, row by row, the entrance first and the exit last
+        entrance, exit_ = (0, self.maze_data["entrance_index"]), (length - 1, self.maze_data["exit_index"])
+        plans = {entrance: self.room_plan(*entrance)}
+        masks = self.raw_matrix.side_masks()
+        for row_index in range(1, length - 1):
+            row = masks[row_index * width:(row_index + 1) * width]
+            for column_index in range(1, width - 1):
+                room_parameters = ROOM_SHAPES[row[column_index]]
+                if room_parameters is not None:
+                    plans[row_index, column_index] = self._plan(row_index, column_index, room_parameters)
+        plans[exit_] = self.room_plan(*exit_)
+        return plans
+
+    def _plan(self, row_index: int, column_index: int, room_parameters: Optional[Mapping]) -> Optional[RoomPlan]:
+        """The plan of the room of a type and rotation at a maze cell, drawn from the world seed and the cell"""
+        if room_parameters is None:
+            return None
+
+        room_type = room_parameters["type"]
+        rng = random.Random(f"{self.seed}:{row_index}:{column_index}")
+        return RoomPlan(room_type, room_parameters["rotation"], RoomChoices.draw(room_type, rng))
+
+    def build_room(self, row_index: int, column_index: int) -> Union['Room', 'Empty']:
+        """Builds the room at a maze cell from scratch
+
+        A room that has been evicted from the cache is rebuilt from its plan exactly as it was first generated.
+        """
+        room_plan = self.room_plan(row_index, column_index)
+        if room_plan is None:
+            return _EMPTY
+
+        return Room(room_plan.room_type, room_plan.rotation, choices=room_plan.choices)
 
     def update_world_location(self, r_location: int, c_location: int) -> bool:
-        """Updated the world location"""
+        """Updated the world location, moving the player into the new active room"""
+        if self.active_room is not None:
+            self.active_room.remove_entity('player')
+
         self.world_location = [r_location, c_location]
-        self.active_room = self.world_matrix[r_location][c_location]
+        self.active_room = self.world_matrix.room(r_location, c_location)
+        self.active_room.add_entity('player', self.player)
         return not self.world_location[0] == 9
 
 
+class EndlessWorld(World):
+    """A world going on forever, made of maze chunks generated as the player gets near them (see src.util.chunks)
+
+    Only the chunks around the player and the most recently used rooms are kept, so memory use stays the same however
+    far the player travels. The world is never completed.
+    """
+
+    def __init__(
+            self,
+            width: int = 15,
+            chunk_height: int = 15,
+            seed: Optional[int] = None,
+            cache_size: int = 16,
+    ):
+        seed = random.getrandbits(64) if seed is None else seed
+        super().__init__(ChunkedMaze(width, chunk_height, seed), seed, cache_size)
+
+    def measure_maze(self) -> dict:
+        """Inherit, the maze has no length and no exit"""
+        return {
+            "width": self.raw_matrix.width,
+            "entrance_index": self.raw_matrix.entrance_index,
+        }
+
+    @property
+    def completed(self) -> bool:
+        """An endless world is never completed"""
+        return False
+
+    def hint(self) -> Optional[str]:
+        """The direction to leave the current room by to get closer to the exit of the chunk, and on to the next one"""
+        row_index, column_index = self.world_location
+        chunk_index, chunk_row = divmod(row_index, self.raw_matrix.chunk_height)
+        return self.raw_matrix.distance_field(chunk_index).next_direction(column_index, chunk_row) or "down"
+
+    def room_parameters(self, row_index: int, column_index: int) -> Optional[Mapping]:
+        """Inherit, only the top row of the maze has a border"""
+        if row_index == 0 and column_index == self.maze_data["entrance_index"]:
+            return {"type": "dead-end", "rotation": 180}
+        if row_index <= 0 or column_index in [0, self.maze_data["width"] - 1]:
+            return None
+        return self.match_cell(row_index, column_index)
+
+    def update_world_location(self, r_location: int, c_location: int) -> bool:
+        """Inherit, generating the chunks ahead of the new location"""
+        self.raw_matrix.focus(r_location)
+        return super().update_world_location(r_location, c_location)
+
+    def close(self) -> None:
+        """Inherit, stop generating chunks"""
+        self.raw_matrix.close()
+
+
+class WorldMatrix:
+    """Lazy matrix of the rooms of a world
+
+    Rooms are built by the world on first access and the `cache_size` most recently used ones are kept in memory.
+    Indexing works like the nested list it replaces: `world_matrix[row][column]`. The matrix of an endless world has
+    as many rows as are asked for, so it has no len().
+
+    A rebuilt room is the room first generated, so what changed in a room is recorded when it is evicted and applied
+    again when it is rebuilt: the cells of the NPCs that moved, e.g. out of the way of a player who answered their
+    question. Doors have no state of their own to keep, the layouts of the rooms are shared.
+    """
+
+    def __init__(self, world: World, cache_size: int):
+        if cache_size < 1:
+            raise ValueError("The room cache must hold at least the active room")
+        self.world = world
+        self.cache_size = cache_size
+        self.rooms = OrderedDict()
+        # Cells of the NPCs that moved in the evicted rooms, by room location then NPC name
+        self.moved_npcs: dict[tuple[int, int], dict[str, int]] = {}
+
+    def room(self, row_index: int, column_index: int) -> Union['Room', 'Empty']:
+        """Returns the room at a maze cell, building it if it is not cached"""
+        location = (row_index, column_index)
+        try:
+            self.rooms.move_to_end(location)
+            return self.rooms[location]
+        except KeyError:
+            pass
+
+        room = self.world.build_room(row_index, column_index)
+        if isinstance(room, Room):
+            moved_npcs = self.moved_npcs.pop(location, None)
+            if moved_npcs is not None:
+                room.place_npcs(moved_npcs)
+            self.rooms[location] = room
+            if len(self.rooms) > self.cache_size:
+                self._evict()
+        return room
+
+    def _evict(self) -> None:
+        """Drop the least recently used room, keeping a record of the NPCs that moved in it"""
+        location, room = self.rooms.popitem(last=False)
+        moved_npcs = room.moved_npcs()
+        if moved_npcs:
+            self.moved_npcs[location] = moved_npcs
+
+    def __len__(self):
+        try:
+            return self.world.maze_data["length"]
+        except KeyError:
+            raise TypeError("The rows of an endless world go on forever, they have no length") from None
+
+    def __getitem__(self, row_index: int) -> '_WorldMatrixRow':
+        # The rows of an endless world are unbounded, only the ones above the first are out of range
+        length = self.world.maze_data.get("length")
+        if row_index < 0 and length is not None:
+            row_index += length
+        if row_index < 0 or length is not None and row_index >= length:
+            raise IndexError('world row out of range')
+        return _WorldMatrixRow(self, row_index)
+
+
+class _WorldMatrixRow:
+    """A single row of a WorldMatrix"""
+
+    def __init__(self, matrix: WorldMatrix, row_index: int):
+        self.matrix = matrix
+        self.row_index = row_index
+
+    def __len__(self):
+        return self.matrix.world.maze_data["width"]
+
+    def __getitem__(self, column_index: int) -> Union['Room', 'Empty']:
+        if column_index < 0:
+            column_index += len(self)
+        if not 0 <= column_index < len(self):
+            raise IndexError('world column out of range')
+        return self.matrix.room(self.row_index, column_index)
+
+
 # Room Data classes
 class Tile:
-    """Parent class definition of Tile"""
+    """Parent class definition of Tile
+
+    Tiles are flyweights: there is one shared, unchanging instance of every kind of tile (see tile()), and rooms only
+    store tile ids.
+    """
+
+    __slots__ = ('vacant', 'representation')
 
-    def __init__(self, vacant: bool):
+    def __init__(self, vacant: bool, representation: str = ""):
         self.vacant = vacant
-        file_path = Path(__file__).parent / 'object_representation.json'
-        with file_path.open('r', encoding='utf8') as object_representation_file:
-            self.object_representation_json = json.load(object_representation_file)
-        self.representation = ""
+        self.representation = representation
 
     def __str__(self):
         return self.representation
@@ -194,9 +461,10 @@ class Wall(Tile):
     Subclass of Tile class
     """
 
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__(False)
-        self.representation = self.object_representation_json["Wall"]
+        super().__init__(False, get_object_representation()["Wall"])
 
 
 class Space(Tile):
@@ -205,9 +473,10 @@ class Space(Tile):
     Subclass of Tile class
     """
 
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__(True)
-        self.representation = self.object_representation_json["Space"]
+        super().__init__(True, get_object_representation()["Space"])
 
 
 class Door(Tile):
@@ -216,104 +485,190 @@ class Door(Tile):
     Subclass of Tile class
     """
 
+    __slots__ = ('locked',)
+
     def __init__(self, locked: bool):
-        super().__init__(True)
+        super().__init__(True, get_object_representation()["Door"][int(locked)])
         self.locked = locked
-        self.representation_selection = self.object_representation_json["Door"]
 
-    def lock_unlock(self) -> None:
-        """Toggle locked state"""
-        self.locked = not self.locked
+    def lock_unlock(self) -> 'Door':
+        """Returns the door tile in the other locked state, as the shared tiles never change"""
+        return tile(DOOR if self.locked else LOCKED_DOOR)
 
     def enter(self) -> bool:
         """Return whether or not player is permitted to enter"""
         return not self.locked
 
-    def __str__(self):
-        return self.representation_selection[int(self.locked)]
-
 
 class Empty:
     """Literally nothingness, a wall in the world"""
 
-    def __init__(self):
-        self.representation = "E"
+    __slots__ = ()
+    representation = "E"
 
     def __str__(self):
         return self.representation
 
 
+_EMPTY = Empty()
+
+
+@lru_cache(maxsize=None)
+def tiles() -> tuple[Tile, ...]:
+    """The shared tile of every tile id"""
+    return Space(), Wall(), Door(locked=False), Door(locked=True)
+
+
+def tile(tile_id: int) -> Tile:
+    """Returns the shared tile of a tile id"""
+    return tiles()[tile_id]
+
+
+class TileTable(NamedTuple):
+    """Glyph and passability of every tile id"""
+
+    glyphs: tuple[str, ...]
+    passable: bytes
+
+
+@lru_cache(maxsize=None)
+def _tile_table() -> TileTable:
+    return TileTable(
+        tuple(str(shared_tile) for shared_tile in tiles()),
+        # translate() needs a full 256 entry table, unknown ids are impassable
+        bytes(
+            shared_tile.vacant and not getattr(shared_tile, 'locked', False) for shared_tile in tiles()
+        ).ljust(256, b'\x00'),
+    )
+
+
+class RoomLayout(NamedTuple):
+    """The tile ids of a rotated room template, row by row, and the matching byte mask of passable cells"""
+
+    tile_ids: bytes
+    passable: bytes
+
+
+@lru_cache(maxsize=None)
+def room_layout(
+        room_type: str,
+        template_index: int,
+        rotation: int,
+        room_templates_filepath: Path = ROOM_TEMPLATES_PATH,
+) -> RoomLayout:
+    """Returns the layout of a room template at a rotation, shared by every room built from them"""
+    template = get_room_templates(room_templates_filepath)[room_type][template_index].layout
+    # Rotate template (if necessary) [0, 90, 180, 270]
+    for _ in range(rotation // 90):
+        template = list(zip(*template[::-1]))
+    # Map template symbols to tile ids, row by row
+    tile_ids = bytes(TILE_IDS.get(symbol, SPACE) for row in template for symbol in row)
+    return RoomLayout(tile_ids, tile_ids.translate(_tile_table().passable))
+
+
+# Names of the NPCs of the rooms, by placement, shared by every room
+_NPC_NAMES = tuple("enemy" + str(placement) for placement in NPC_PLACEMENTS)
+
+
 class Room:
     """Class definition of Room
 
     For simplicity, grid size will always have dimensions of 9*9 (excluding walls)
+
+    The layout is stored row by row as tile ids, with a matching byte mask of passable cells. Both are shared by every
+    room built from the same template and rotation, so a room only holds its entities. Rooms keep no display: draw()
+    composites the entities over the tiles into rows owned by the caller, e.g. the buffer of the renderer.
+    An occupancy map holds the NPC standing on each cell, so collision checks and NPC lookups are O(1).
+    The player is not part of the map: NPCs guard the cells just inside the doors, which is also where the player
+    lands when entering a room, so the two may share a cell.
     """
 
+    __slots__ = ('room_type', 'rotation', 'choices', 'tile_ids', 'passable', 'entity_dict', 'occupancy')
+    representation = "R"
+
     def __init__(
             self,
             room_type: str,
             rotation: int,
-            room_templates_filepath: Path = Path(__file__).parent / 'room_templates.json',
+            room_templates_filepath: Path = ROOM_TEMPLATES_PATH,
+            rng: Optional[random.Random] = None,
+            choices: Optional[RoomChoices] = None,
     ):
         accepted_room_types = ["dead-end", "straight", "corner", "3-way-junction", "4-way-junction"]
         self.room_type = room_type if room_type in accepted_room_types else "straight"
         self.rotation = rotation
-        self.display_array = []
         self.entity_dict = {}
-        self.tiles = []
-        self.representation = "R"
-        # Use JSON file to generate Room grid layout
-        with room_templates_filepath.open('r', encoding='utf8') as room_templates:
-            template = random.choice(json.load(room_templates)[self.room_type])["layout"]
-        # Rotate template (if necessary) [0, 90, 180, 270]
-        for _ in range(rotation // 90):
-            template = list(zip(*template[::-1]))
-        # Map template spaces to Tiles in Room
-        for y_coord in template:
-            row = []
-            for x_coord in y_coord:
-                # Anyone know how to implement a switch statement in Python?
-                if x_coord == "#":
-                    row.append(str(Wall()))
-                elif x_coord == " ":
-                    row.append(str(Space()))
-                elif x_coord == "/":
-                    row.append(str(Door(locked=False)))
-                elif x_coord == "|":
-                    row.append(str(Door(locked=True)))
-                else:
-                    row.append(str(Space()))
-            self.tiles.append(row)
-        placements = random.choice([(5, 1), (9, 5), (5, 9), (1, 5)])
+        # Pick the template and NPC at random, unless the choices were made beforehand
+        if choices is None:
+            choices = RoomChoices.draw(self.room_type, random if rng is None else rng, room_templates_filepath)
+        self.choices = choices
+        # Use the shared room templates to generate Room grid layout
+        self.tile_ids, self.passable = room_layout(self.room_type, choices.template, rotation, room_templates_filepath)
+        # Name of the NPC standing on each occupied cell, the player is tracked through its own entity
+        self.occupancy: dict[int, str] = {}
+        placements = NPC_PLACEMENTS[choices.npc_placement]
         self.add_entity(
-            "enemy" + str(placements),
-            NPC(placements[0], placements[1])
+            _NPC_NAMES[choices.npc_placement],
+            NPC(placements[0], placements[1], representation_index=choices.npc_representation)
         )
 
     def add_entity(self, entity_name: str, entity: 'Entity') -> None:
-        """Adds entity object to Room"""
-        can_add = True
+        """Adds entity object to Room, unless the space is already taken"""
+        cell = entity.cell
+        if cell in self.occupancy:
+            return
+
+        if entity_name != "player":
+            player = self.entity_dict.get("player")
+            if player is not None and player.cell == cell:
+                return
+            self.occupancy[cell] = entity_name
+
+        self.entity_dict[entity_name] = entity
+
+    def remove_entity(self, entity_name: str) -> Optional['Entity']:
+        """Removes an entity object from the Room and returns it, if it was there"""
+        entity = self.entity_dict.pop(entity_name, None)
+        if entity is not None and entity_name != "player":
+            self.occupancy.pop(entity.cell, None)
+        return entity
+
+    def moved_npcs(self) -> dict[str, int]:
+        """Returns the cells of the NPCs no longer standing where the room placed them, by name"""
+        name = _NPC_NAMES[self.choices.npc_placement]
+        npc = self.entity_dict.get(name)
+        placement = NPC_PLACEMENTS[self.choices.npc_placement]
+        if npc is None or npc.cell == placement[1] * ROOM_SIZE + placement[0]:
+            return {}
+        return {name: npc.cell}
+
+    def place_npcs(self, cells: Mapping[str, int]) -> None:
+        """Moves NPCs straight to cells by name, e.g. back to where they were before the room was rebuilt"""
+        for name, cell in cells.items():
+            npc = self.entity_dict.get(name)
+            if npc is not None:
+                del self.occupancy[npc.cell]
+                self.occupancy[cell] = name
+                npc.cell = cell
+
+    def draw(self, rows: list[list[str]]) -> None:
+        """Combines tiles and entities into rows of glyphs, updated in place"""
+        glyphs = _tile_table().glyphs
+        tile_ids = self.tile_ids
+        offset = 0
+        for row in rows:
+            for x in range(ROOM_SIZE):
+                row[x] = glyphs[tile_ids[offset + x]]
+            offset += ROOM_SIZE
         for entities in self.entity_dict.values():
-            can_add = entity.get_location() != entities.get_location()
-        if can_add:
-            self.entity_dict.update({entity_name: entity})
-
-    def update_display(self) -> None:
-        """Combines tiles and entities to update display"""
-        self.display_array = deepcopy(self.tiles)
-        for entities in self.entity_dict.values():
-            location = entities.get_location()
-            self.display_array[location[1]][location[0]] = str(entities)
-
-    def render(self, terminal: Terminal, echo: Callable[[str], None]) -> None:
-        """Render the current room state to the terminal"""
-        echo(terminal.move_xy(0, 0))
-        echo(terminal.clear)
+            y, x = divmod(entities.cell, ROOM_SIZE)
+            rows[y][x] = entities.representation
 
-        start_y = (terminal.height - len(self.display_array)) // 2
-        echo(terminal.move_downs(start_y))
-        for row in self.display_array:
-            echo(terminal.center("".join(row)))
+    def display(self) -> list[list[str]]:
+        """Returns new rows of glyphs with the entities drawn over the tiles"""
+        rows = [[""] * ROOM_SIZE for _ in range(ROOM_SIZE)]
+        self.draw(rows)
+        return rows
 
     # def display(self) -> tuple[str, dict]:
     #     """Display room"""
@@ -365,75 +720,77 @@ class Room:
 
     def move_entity(self, direction: str, entity_name: str) -> bool:
         """Alter coord of entity in self.entity_dict"""
-        translation = {"up": (0, -1), "left": (-1, 0), "down": (0, 1), "right": (1, 0)}[direction]
+        translation = _TRANSLATIONS[direction]
         entity = self.entity_dict[entity_name]
-        location = entity.get_location()
-        x_translated = int(location[0] + translation[0])
-        y_translated = int(location[1] + translation[1])
-        # Detect entities in translation space
-        for entities in self.entity_dict.items():
-            if entities[0] != "player":
-                space_vacancy = [x_translated, y_translated] != entities[1].get_location()
-        # print(self.term.center(entity.get_location()))
-        # print(self.term.center(direction))
-        # print(self.term.center({True: "Space vacant", False: "Space not vacant"}[space_vacancy]))
-        if x_translated in range(0, 11) and y_translated in range(0, 11):
-            tile_vacancy = self.tiles[y_translated][x_translated] in ["  ", "//"]
-            # print(self.term.center({True: "Tile vacant", False: "Tile not vacant"}[tile_vacancy]))
-        else:
-            tile_vacancy = False
-            # print(self.term.center("Tile out of range"))
-        if tile_vacancy and space_vacancy:
-            entity.update_location(x_translated, y_translated)
-            return True
-        else:
+        y, x = divmod(entity.cell, ROOM_SIZE)
+        x_translated = x + translation[0]
+        y_translated = y + translation[1]
+        if not (0 <= x_translated < ROOM_SIZE and 0 <= y_translated < ROOM_SIZE):
+            return False
+
+        cell = y_translated * ROOM_SIZE + x_translated
+        # Walls and NPCs block the way, the player does not
+        if not self.passable[cell] or cell in self.occupancy:
             return False
 
+        if entity_name != "player":
+            del self.occupancy[entity.cell]
+            self.occupancy[cell] = entity_name
+        entity.cell = cell
+        return True
+
     def __str__(self):
         return self.representation
 
-    def scan_for_adjacent_NPC(self) -> Optional[list['Entity']]:
-        """Scans for adjacent NPCs"""
-        location = self.entity_dict["player"].get_location()
-        adjacent_spaces = [
-            [location[0], location[1] + 1],
-            [location[0] + 1, location[1]],
-            [location[0], location[1] - 1],
-            [location[0] - 1, location[1]]
-        ]
-        for entities in self.entity_dict.items():
-            if entities[0] != "player" and entities[1].get_location() in adjacent_spaces:
-                return entities
+    def scan_for_adjacent_NPC(self) -> Optional[tuple[str, 'Entity']]:
+        """Scans for adjacent NPCs, returning the name and entity of the first one found"""
+        y, x = divmod(self.entity_dict["player"].cell, ROOM_SIZE)
+        for translation in _ADJACENT_TRANSLATIONS:
+            x_adjacent = x + translation[0]
+            y_adjacent = y + translation[1]
+            if 0 <= x_adjacent < ROOM_SIZE and 0 <= y_adjacent < ROOM_SIZE:
+                entity_name = self.occupancy.get(y_adjacent * ROOM_SIZE + x_adjacent)
+                if entity_name is not None:
+                    return entity_name, self.entity_dict[entity_name]
         return None
 
 
 # Entity Data classes
 class Entity:
-    """Class definition of Entity Superclass"""
+    """Class definition of Entity Superclass
+
+    The location is stored as a single cell index into the room, row by row.
+    """
+
+    __slots__ = ('cell', 'representation')
 
     def __init__(self, x_location: int, y_location: int):
-        self.location = [x_location, y_location]
-        self.tile_location = [10 - y_location, x_location]
-        object_representation_filepath = Path(__file__).parent / 'object_representation.json'
-        with object_representation_filepath.open('r', encoding='utf8') as object_representation_file:
-            self.object_representation_json = json.load(object_representation_file)
+        self.cell = y_location * ROOM_SIZE + x_location
         self.representation = ""
 
-    def get_location(self) -> list[int]:
+    @property
+    def location(self) -> tuple[int, int]:
+        """Location data (x, y)"""
+        y, x = divmod(self.cell, ROOM_SIZE)
+        return x, y
+
+    def get_location(self) -> tuple[int, int]:
         """Returns location data (x, y)"""
         return self.location
 
-    def get_tile_location(self) -> list[int]:
+    def get_tile_location(self) -> tuple[int, int]:
         """Returns tile location data (y, 10-x)"""
-        return self.tile_location
+        x, y = self.location
+        return y, 10 - x
 
     def update_location(self, x_location: int = None, y_location: int = None) -> None:
         """Updates location data"""
+        x, y = self.location
         if x_location is not None and x_location >= 0 and x_location <= 10:
-            self.location[0] = x_location
+            x = x_location
         if y_location is not None and y_location >= 0 and y_location <= 10:
-            self.location[1] = y_location
-        self.tile_location = [self.location[1], 10 - self.location[0]]
+            y = y_location
+        self.cell = y * ROOM_SIZE + x
 
     def __str__(self):
         return self.representation
@@ -469,11 +826,21 @@ class Entity:
 class NPC(Entity):
     """Class definition of NPC Entity"""
 
-    def __init__(self, x_location: int, y_location: int):
+    __slots__ = ()
+
+    def __init__(
+            self,
+            x_location: int,
+            y_location: int,
+            rng: Optional[random.Random] = None,
+            representation_index: Optional[int] = None,
+    ):
         super().__init__(x_location, y_location)
-        super().get_location()
-        super().update_location()
-        self.representation = random.choice(self.object_representation_json["NPC"])
+        representations = get_object_representation()["NPC"]
+        if representation_index is None:
+            self.representation = (random if rng is None else rng).choice(representations)
+        else:
+            self.representation = representations[representation_index]
 
 
 #        self.riddle = Riddle()
@@ -489,8 +856,8 @@ class NPC(Entity):
 class Player(Entity):
     """Class definition of Player Entity"""
 
+    __slots__ = ()
+
     def __init__(self, x_location: int, y_location: int):
         super().__init__(x_location, y_location)
-        super().get_location()
-        super().update_location()
-        self.representation = self.object_representation_json["Player"]
+        self.representation = get_object_representation()["Player"]
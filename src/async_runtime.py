@@ -0,0 +1,97 @@
+"""asyncio runtime for the game, an alternative to running the manager on a thread fed through a queue.Queue
+
+The keyboard reader, the section loops and their ticks all run on one event loop. Keystrokes are read as soon as the
+terminal has input for the event loop, so there is no polling interval and no handoff between threads. Sections are
+unchanged: AsyncSection drives the same main loop as GameSection.__call__, awaiting input instead of blocking on it.
+
+The threaded runtime stays the default, run the game with `--runtime asyncio` to use this one.
+"""
+import asyncio
+import time
+from typing import Optional
+
+from blessed import Terminal
+from blessed.keyboard import Keystroke
+
+from src.sections.base import GameSection
+
+
+class AsyncSection:
+    """Adapter running the main loop of a GameSection as a coroutine
+
+    The section must have been created with an asyncio.Queue as its input queue.
+    """
+
+    def __init__(self, section: GameSection):
+        self.section = section
+
+    async def __call__(self, terminal: Terminal, start_data: object) -> object:
+        """Run the main loop of the section, returning what the section returns when it stops"""
+        section = self.section
+        section.start_loop(terminal, start_data)
+
+        while section.running:
+            result = section.step(terminal, await self._get_input(section.next_tick))
+            if result is not None:
+                return result
+
+        return section.handle_stop()
+
+    async def _get_input(self, deadline: Optional[float]) -> Optional[Keystroke]:
+        """Wait for the next keystroke until the deadline, or forever if there is none"""
+        in_queue: asyncio.Queue = self.section._in_queue
+        if deadline is None:
+            return await in_queue.get()
+
+        timeout = deadline - time.monotonic()
+        if timeout <= 0 or not in_queue.empty():
+            try:
+                return in_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return None
+
+        try:
+            return await asyncio.wait_for(in_queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class KeyboardReader:
+    """Puts the keystrokes typed in a terminal on an asyncio queue, reading them when the event loop sees input"""
+
+    def __init__(self, terminal: Terminal, in_queue: asyncio.Queue):
+        self.terminal = terminal
+        self.in_queue = in_queue
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> None:
+        """Start watching the keyboard of the terminal"""
+        if self.terminal._keyboard_fd is None:
+            raise RuntimeError('The asyncio runtime needs a terminal with a keyboard')
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(self.terminal._keyboard_fd, self._read)
+
+    def stop(self) -> None:
+        """Stop watching the keyboard"""
+        if self._loop is not None:
+            self._loop.remove_reader(self.terminal._keyboard_fd)
+            self._loop = None
+
+    def _read(self) -> None:
+        # Read every complete keystroke waiting, blessed keeps partial sequences buffered for the next call
+        key = self.terminal.inkey(timeout=0)
+        while key != '':
+            self.in_queue.put_nowait(key)
+            key = self.terminal.inkey(timeout=0)
+
+
+async def run(manager_cls: type, terminal: Terminal) -> None:
+    """Run a game manager and the keyboard reader on the current event loop, until the game ends"""
+    in_queue = asyncio.Queue()
+    manager = manager_cls(in_queue, terminal)
+    reader = KeyboardReader(terminal, in_queue)
+    reader.start()
+    try:
+        await manager.run_async()
+    finally:
+        reader.stop()
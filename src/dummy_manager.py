@@ -1,21 +1,25 @@
 import queue
 from abc import ABC, abstractmethod
+from typing import Optional
 
 from blessed import Terminal
 
+from src.async_runtime import AsyncSection
 from src.sections.debug import Debug
 from src.sections.game_over import GameOver
 from src.sections.menu import Menu, StartMenuType
 from src.sections.over_world import OverWorld, StartOverWorld
 from src.sections.question import NewQuestion, Question
+from src.util.metrics import Metrics
 
 
 class DummyGameManager(ABC):
     """A dummy game manager for testing purposes"""
 
-    def __init__(self, in_queue: queue.Queue, terminal: Terminal):
+    def __init__(self, in_queue: queue.Queue, terminal: Terminal, metrics: Optional[Metrics] = None):
         self.terminal = terminal
         self.in_queue = in_queue
+        self.metrics = metrics if metrics is not None else Metrics()
 
     @property
     @abstractmethod
@@ -32,10 +36,21 @@ class DummyGameManager(ABC):
     def __call__(self):
         """Run the dummy manager loop"""
         section = self.section_class(self.in_queue)
+        section.use_metrics(self.metrics)
         data = section(self.terminal, self.start_data)
         debug = Debug(self.in_queue)
+        debug.use_metrics(self.metrics)
         debug(self.terminal, data)
 
+    async def run_async(self) -> None:
+        """Run the dummy manager loop on the event loop"""
+        section = self.section_class(self.in_queue)
+        section.use_metrics(self.metrics)
+        data = await AsyncSection(section)(self.terminal, self.start_data)
+        debug = Debug(self.in_queue)
+        debug.use_metrics(self.metrics)
+        await AsyncSection(debug)(self.terminal, data)
+
 
 class DummyMenuManager(DummyGameManager):
     """Dummy manager for the Menu"""
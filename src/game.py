@@ -1,31 +1,81 @@
+import os
+import random
 import threading
+from functools import partial
 from queue import Queue
+from typing import Optional
 
 from blessed import Terminal
 
+from src.util.metrics import Metrics
+
 FPS = 60
+RUNTIMES = ('threaded', 'asyncio')
 
 
 class Game:
     """The top level class for the game"""
 
-    def __init__(self, manager_cls: type):
+    def __init__(
+            self,
+            manager_cls: type,
+            metrics_path: Optional[os.PathLike] = None,
+            runtime: str = 'threaded',
+            record_path: Optional[os.PathLike] = None,
+    ):
+        if runtime not in RUNTIMES:
+            raise ValueError(f"Unknown runtime {runtime!r}, expected one of {RUNTIMES}")
         self.manager_cls = manager_cls
+        self.metrics_path = metrics_path
+        self.runtime = runtime
+        self.record_path = record_path
 
     def run(self) -> None:
         """The run method for the game, handling the TUI"""
         term = Terminal()
+
+        metrics = Metrics()
+        manager_cls = partial(self.manager_cls, metrics=metrics)
+        recorder = None
+        if self.record_path is not None:
+            from src.util.recording import Recorder
+
+            # Seeding the random generator before the manager is created makes the game replayable
+            seed = random.getrandbits(64)
+            random.seed(seed)
+            recorder = Recorder(seed, term.width, term.height)
+            manager_cls = recorder.manager_factory(manager_cls)
+
+        try:
+            with term.fullscreen(), term.raw(), term.hidden_cursor(), term.location():
+                if self.runtime == 'asyncio':
+                    # asyncio is slow to import, so the threaded runtime does not load it
+                    import asyncio
+
+                    from src import async_runtime
+                    asyncio.run(async_runtime.run(manager_cls, term))
+                else:
+                    self.run_threaded(term, manager_cls)
+
+                print(term.normal + term.clear)
+        finally:
+            # A game that crashed is recorded too, to reproduce the crash
+            if recorder is not None:
+                recorder.save(self.record_path)
+
+        if self.metrics_path is not None:
+            metrics.dump(self.metrics_path)
+
+    def run_threaded(self, term: Terminal, manager_cls: Optional[type] = None) -> None:
+        """Run the manager on its own thread, feeding it the keystrokes polled on this one"""
         input_queue = Queue()
 
-        manager = self.manager_cls(input_queue, term)
+        manager = (manager_cls or self.manager_cls)(input_queue, term)
         manager_thread = threading.Thread(target=manager)
         manager_thread.start()
 
-        with term.fullscreen(), term.raw(), term.hidden_cursor(), term.location():
-            while manager_thread.is_alive():
-                inp = term.inkey(1 / FPS)
-
-                if inp != '':
-                    input_queue.put(inp)
+        while manager_thread.is_alive():
+            inp = term.inkey(1 / FPS)
 
-            print(term.normal + term.clear)
+            if inp != '':
+                input_queue.put(inp)
@@ -0,0 +1,190 @@
+"""Headless driver running the game against a virtual terminal and scripted keystrokes
+
+This makes it possible to soak test the game logic and measure engine throughput without a TTY:
+
+    python -m src.headless --steps 1000000 --seed 42
+"""
+import queue
+import random
+import time
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+from blessed import Terminal
+from blessed.keyboard import Keystroke, resolve_sequence
+
+from src.manager import GameManager
+from src.util.metrics import Metrics
+
+# Sequences sent by a terminal for the keys the game reacts to
+KEY_SEQUENCES = {
+    'KEY_UP': '\x1b[A',
+    'KEY_DOWN': '\x1b[B',
+    'KEY_RIGHT': '\x1b[C',
+    'KEY_LEFT': '\x1b[D',
+    'KEY_ENTER': '\r',
+    'KEY_TAB': '\t',
+}
+# Keys used for generated keystroke streams, weighted towards moving around the over world
+RANDOM_KEYS = ['KEY_UP', 'KEY_DOWN', 'KEY_RIGHT', 'KEY_LEFT'] * 4 + ['KEY_TAB', 'KEY_ENTER']
+
+
+class NullStream:
+    """A text stream that throws away everything written to it, only counting the bytes"""
+
+    encoding = 'utf8'
+
+    def __init__(self):
+        self.bytes_written = 0
+
+    def write(self, text: str) -> int:
+        """Discard the text"""
+        self.bytes_written += len(text.encode(self.encoding))
+        return len(text)
+
+    def flush(self) -> None:
+        """Nothing to flush"""
+        pass
+
+
+class VirtualTerminal(Terminal):
+    """A blessed Terminal of a fixed size, writing to a stream that does not need to be a TTY"""
+
+    def __init__(self, width: int = 80, height: int = 24, stream: Optional[object] = None):
+        super().__init__(kind='xterm-256color', stream=NullStream() if stream is None else stream, force_styling=True)
+        self._virtual_size = (width, height)
+        self._keystrokes: dict[str, Keystroke] = {}
+
+    @property
+    def width(self) -> int:
+        """The fixed width of the terminal"""
+        return self._virtual_size[0]
+
+    @property
+    def height(self) -> int:
+        """The fixed height of the terminal"""
+        return self._virtual_size[1]
+
+    def keystroke(self, key: str) -> Keystroke:
+        """Returns the keystroke for a key name such as 'KEY_UP', or for the text typed"""
+        try:
+            return self._keystrokes[key]
+        except KeyError:
+            keystroke = resolve_sequence(KEY_SEQUENCES.get(key, key), self._keymap, self._keycodes)
+            self._keystrokes[key] = keystroke
+            return keystroke
+
+
+class ScriptedInput:
+    """Stands in for the input queue of the sections, handing out keystrokes from an iterable of keys
+
+    Keystrokes are handed out straight away, whatever the timeout. Once the keys run out every read returns Ctrl+C,
+    which ends the game.
+    """
+
+    def __init__(self, terminal: VirtualTerminal, keys: Iterable[str]):
+        self._terminal = terminal
+        self._keys = iter(keys)
+        self._end = terminal.keystroke(chr(3))
+        self.exhausted = False
+        self.steps = 0
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Keystroke:
+        """Returns the next keystroke"""
+        try:
+            key = next(self._keys)
+        except StopIteration:
+            self.exhausted = True
+            return self._end
+
+        self.steps += 1
+        return self._terminal.keystroke(key)
+
+    def get_nowait(self) -> Keystroke:
+        """Returns the next keystroke"""
+        return self.get(False)
+
+    def put(self, key: str) -> None:
+        """Scripted input can not be added to"""
+        raise queue.Full('Scripted input can not be added to')
+
+    def qsize(self) -> int:
+        """There is always input waiting until the script runs out"""
+        return 0 if self.exhausted else 1
+
+
+@dataclass
+class HeadlessStats:
+    """The outcome of a headless run"""
+
+    steps: int
+    games: int
+    seconds: float
+    bytes_written: int
+
+    @property
+    def steps_per_second(self) -> float:
+        """Keystrokes processed per second"""
+        return self.steps / self.seconds if self.seconds else 0.0
+
+
+def random_keys(count: int, seed: Optional[int] = None) -> Iterator[str]:
+    """Generates count random keystrokes, the first one choosing to play from the start menu"""
+    rng = random.Random(seed)
+    yield '1'
+    for _ in range(count - 1):
+        yield rng.choice(RANDOM_KEYS)
+
+
+def run(
+        keys: Iterable[str],
+        width: int = 80,
+        height: int = 24,
+        manager_cls: type = GameManager,
+        metrics: Optional[Metrics] = None,
+) -> HeadlessStats:
+    """Play games with the scripted keys until they run out, without sleeping or animating
+
+    The frames of every game are recorded in metrics, when given.
+    """
+    terminal = VirtualTerminal(width, height)
+    scripted_input = ScriptedInput(terminal, keys)
+    games = 0
+
+    start = time.perf_counter()
+    while not scripted_input.exhausted:
+        manager = manager_cls(scripted_input, terminal, realtime=False, metrics=metrics)
+        manager()
+        games += 1
+    seconds = time.perf_counter() - start
+
+    return HeadlessStats(scripted_input.steps, games, seconds, terminal.stream.bytes_written)
+
+
+def main() -> None:
+    """Run a headless soak test with a generated keystroke stream"""
+    parser = ArgumentParser(description='Run the game headless with random keystrokes')
+    parser.add_argument('--steps', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--width', type=int, default=80)
+    parser.add_argument('--height', type=int, default=24)
+    parser.add_argument('--metrics', dest='metrics_path', default=None, help='file to dump the frame metrics to')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    metrics = Metrics()
+    stats = run(random_keys(args.steps, args.seed), args.width, args.height, metrics=metrics)
+
+    print(f"steps:        {stats.steps}")
+    print(f"games:        {stats.games}")
+    print(f"seconds:      {stats.seconds:.2f}")
+    print(f"steps/second: {stats.steps_per_second:.0f}")
+    print(f"bytes output: {stats.bytes_written}")
+
+    if args.metrics_path is not None:
+        metrics.dump(args.metrics_path)
+
+
+if __name__ == '__main__':
+    main()
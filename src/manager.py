@@ -1,37 +1,143 @@
+import importlib
 import queue
+import sys
+import threading
+from typing import Optional
 
 from blessed import Terminal
 
 from src.commands import ChangeSection, EndGame, StartGame
-from src.sections.bootstrap import Bootstrap
-from src.sections.game_over import GameOver
-from src.sections.menu import Menu
-from src.sections.over_world import OverWorld
-from src.sections.question import Question
+from src.sections.base import GameSection
+from src.util.metrics import Metrics
+
+# The module and class of every section, by the name ChangeSection uses for it. A section is only imported and
+# built the first time the game changes to it, so the menu does not wait for the world or the question bank.
+SECTIONS = {
+    'bootstrap': ('src.sections.bootstrap', 'Bootstrap'),
+    'menu': ('src.sections.menu', 'Menu'),
+    'over_world': ('src.sections.over_world', 'OverWorld'),
+    'question': ('src.sections.question', 'Question'),
+    'game_over': ('src.sections.game_over', 'GameOver'),
+}
 
 
 class GameManager:
-    """Game manager class"""
+    """Game manager class
+
+    The sections are attributes named after SECTIONS, built on first use. With warm_up the modules of the sections
+    are imported on a background thread as soon as the game starts, while the menu is up. The sections themselves are
+    still built on the thread running the game: they draw from the global random generator, and building them in the
+    order the game reaches them keeps recorded games replayable.
 
-    def __init__(self, in_queue: queue.Queue, terminal: Terminal):
+    Every manager records the frames of its sections in metrics of its own, unless given metrics to share, so that
+    the games of a server do not mix their timings or their overlay.
+    """
+
+    def __init__(
+            self,
+            in_queue: queue.Queue,
+            terminal: Terminal,
+            realtime: bool = True,
+            warm_up: bool = True,
+            metrics: Optional[Metrics] = None,
+    ):
         self.terminal = terminal
-        self.over_world = OverWorld(in_queue)
-        self.question = Question(in_queue)
-        self.menu = Menu(in_queue)
-        self.bootstrap = Bootstrap(in_queue)
-        self.game_over = GameOver(in_queue)
+        self.in_queue = in_queue
+        self.warm_up = warm_up
+        self.metrics = metrics if metrics is not None else Metrics()
+        # Attributes set on every section when it is built, see configure_sections()
+        self._section_attributes = {'realtime': realtime}
+        self._sections: dict[str, GameSection] = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> GameSection:
+        """The section called name, built the first time it is asked for"""
+        if name in SECTIONS:
+            return self.section(name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def section(self, name: str) -> GameSection:
+        """Returns a section by name, importing its module and building it if it is not built yet"""
+        with self._lock:
+            section = self._sections.get(name)
+            if section is None:
+                module_name, class_name = SECTIONS[name]
+                section = getattr(importlib.import_module(module_name), class_name)(self.in_queue)
+                section.use_metrics(self.metrics)
+                for attribute, value in self._section_attributes.items():
+                    setattr(section, attribute, value)
+                self._sections[name] = section
+            return section
+
+    @property
+    def sections(self) -> list[GameSection]:
+        """The game sections of the manager built so far"""
+        return list(self._sections.values())
+
+    def configure_sections(self, **attributes: object) -> None:
+        """Set attributes on every section, the ones built so far and the ones built later"""
+        with self._lock:
+            self._section_attributes.update(attributes)
+            for section in self._sections.values():
+                for attribute, value in attributes.items():
+                    setattr(section, attribute, value)
+
+    def start_warm_up(self) -> None:
+        """Import the modules of the sections on a background thread, unless they are all imported already"""
+        modules = [module_name for module_name, _ in SECTIONS.values() if module_name not in sys.modules]
+        if not modules:
+            return
+
+        def import_modules() -> None:
+            for module_name in modules:
+                importlib.import_module(module_name)
+
+        threading.Thread(target=import_modules, name='section-warm-up', daemon=True).start()
 
     def __call__(self):
         """Call dunder method"""
+        if self.warm_up:
+            self.start_warm_up()
+        active = self.bootstrap
+        data = StartGame()
+
+        try:
+            while not isinstance(data, EndGame):
+                self.clear_screen()
+                active, data = self.next_section(active, active(self.terminal, data))
+        finally:
+            self.close()
+
+    async def run_async(self) -> None:
+        """Run the game with every section driven by the event loop, see src.async_runtime"""
+        # Only this runtime needs asyncio, which is slow to import
+        from src.async_runtime import AsyncSection
+
+        if self.warm_up:
+            self.start_warm_up()
         active = self.bootstrap
         data = StartGame()
 
-        while not isinstance(data, EndGame):
-            print(self.terminal.move_xy(0, 0))
-            print(self.terminal.clear)
+        try:
+            while not isinstance(data, EndGame):
+                self.clear_screen()
+                active, data = self.next_section(active, await AsyncSection(active)(self.terminal, data))
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Release what the sections hold on to, the world of the over world"""
+        over_world = self._sections.get('over_world')
+        if over_world is not None:
+            over_world.world.close()
 
-            data = active(self.terminal, data)
+    def clear_screen(self) -> None:
+        """Clear the screen before a section starts"""
+        print(self.terminal.move_xy(0, 0), file=self.terminal.stream)
+        print(self.terminal.clear, file=self.terminal.stream)
 
-            if isinstance(data, ChangeSection):
-                active = getattr(self, data.new_section)
-                data = data.data
+    def next_section(self, active: GameSection, result: object) -> tuple[GameSection, object]:
+        """Returns the section to run after the active one returned result, with the data to start it with"""
+        if isinstance(result, ChangeSection):
+            return self.section(result.new_section), result.data
+        return active, result
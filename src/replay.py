@@ -0,0 +1,101 @@
+"""Replay of a recorded game, in real time or as fast as possible
+
+A replay takes the same steps as the recorded game and checks that it ends in the same state. Played as fast as
+possible with the output thrown away, it measures the whole engine on real play:
+
+    python main.py --record game.rec
+    python -m src.replay game.rec --repeat 5
+    python -m src.replay game.rec --realtime
+"""
+import random
+import sys
+import time
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from typing import Optional
+
+from src.headless import VirtualTerminal
+from src.manager import GameManager
+from src.util.metrics import Metrics
+from src.util.recording import Recording, ReplayInput, game_state
+
+
+@dataclass
+class ReplayStats:
+    """The outcome of a replay"""
+
+    steps: int
+    seconds: float
+    bytes_written: Optional[int]
+    state: dict
+    matches: bool
+
+    @property
+    def steps_per_second(self) -> float:
+        """Steps replayed per second"""
+        return self.steps / self.seconds if self.seconds else 0.0
+
+
+def replay(
+        recording: Recording,
+        realtime: bool = False,
+        stream: Optional[object] = None,
+        metrics: Optional[Metrics] = None,
+) -> ReplayStats:
+    """Play a recorded game through the sections, writing its frames to stream, or throwing them away if it is None
+
+    The frames are recorded in metrics, when given.
+    """
+    terminal = VirtualTerminal(recording.width, recording.height, stream)
+    replay_input = ReplayInput(terminal, recording, realtime)
+
+    random.seed(recording.seed)
+    manager = GameManager(replay_input, terminal, metrics=metrics)
+    manager.configure_sections(clock=replay_input.clock)
+
+    start = time.perf_counter()
+    manager()
+    seconds = time.perf_counter() - start
+
+    state = game_state(manager)
+    bytes_written = getattr(terminal.stream, 'bytes_written', None)
+    return ReplayStats(replay_input.steps, seconds, bytes_written, state, state == recording.state)
+
+
+def main() -> None:
+    """Replay a recorded game"""
+    parser = ArgumentParser(description='Replay a recorded game')
+    parser.add_argument('recording')
+    parser.add_argument('--realtime', action='store_true', help='replay at the recorded pace, showing the frames')
+    parser.add_argument('--repeat', type=int, default=1, help='number of replays, the fastest one is reported')
+    parser.add_argument('--metrics', dest='metrics_path', default=None, help='file to dump the frame metrics to')
+    args = parser.parse_args()
+
+    recording = Recording.load(args.recording)
+    metrics = Metrics()
+    if args.realtime:
+        terminal = VirtualTerminal(recording.width, recording.height, sys.stdout)
+        with terminal.fullscreen(), terminal.hidden_cursor():
+            runs = [replay(recording, realtime=True, stream=sys.stdout, metrics=metrics)]
+    else:
+        runs = [replay(recording, metrics=metrics) for _ in range(args.repeat)]
+    stats = min(runs, key=lambda run: run.seconds)
+
+    print(f"steps:        {stats.steps}")
+    print(f"seconds:      {stats.seconds:.3f}")
+    print(f"steps/second: {stats.steps_per_second:.0f}")
+    if stats.bytes_written is not None:
+        print(f"bytes output: {stats.bytes_written}")
+
+    if args.metrics_path is not None:
+        metrics.dump(args.metrics_path)
+
+    mismatch = next((run for run in runs if not run.matches), None)
+    if mismatch is not None:
+        print(f"final state differs from the recording: {mismatch.state} instead of {recording.state}")
+        sys.exit(1)
+    print("final state matches the recording")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,21 @@
+import math
 import queue
+import time
 from abc import ABC, abstractmethod
-from functools import partial
 from typing import Callable, Optional
 
 from blessed import Terminal
 from blessed.keyboard import Keystroke
 
 from src.commands import EndGame
+from src.util.frame_writer import FrameWriter
+from src.util.metrics import (
+    OVERLAY_KEY, Metrics, clear_overlay, render_overlay
+)
+from src.util.timeline import Timeline
 
-_echo = partial(print, end='', flush=True)
+# Ticks per second while an animation is playing on the timeline of a section
+ANIMATION_TICK_RATE = 60
 
 
 class GameSection(ABC):
@@ -19,11 +26,13 @@ class GameSection(ABC):
     - handle_start which is called once each time this section of the game is started (e.g. passing from a question
     back to the over world)
 
-    - run_processing which receives the player input and is called repeatedly (once per frame), this is where you
-    will implement most of your logic
+    - run_processing which receives the player input and is called for every keystroke, this is where you
+    will implement most of your logic. It is also called with None once when the section starts and then on every
+    tick if the section sets a tick_rate
 
     - run_rendering which handles the rendering of the current state using Blessed, only called if run_processing
-    returns True
+    returns True. Everything passed to echo is written to the terminal in one go once run_rendering returns; sections
+    that animate can call echo.flush() to show a partial frame
 
     - handle_stop which is called once each time this section of the game is started, just before it stops and hands
     control back to the manager
@@ -32,29 +41,116 @@ class GameSection(ABC):
 
     - stop() which should be called to indicate this game section should stop (e.g. you encounter an NPC on the over
     world)
+
+    - timeline, on which animations are scheduled as effects drawing to the terminal (see src.util.timeline). The
+    timeline advances on every pass of the main loop and the effects that are due are drawn after run_rendering.
+    While an animation plays the section ticks, input keeps being processed, and the section may call
+    timeline.skip() to jump to the end. When the section is not running in real time (e.g. headless) animations play
+    at infinite speed.
+
+    The main loop blocks on the input queue until either a keystroke arrives or the next tick is due, so an idle
+    section does not use any CPU. Sections needing time based updates set tick_rate (ticks per second, on the class or
+    the instance), and run_processing is then called with None at that fixed rate. Calling the section runs the loop
+    on the current thread; it is made of start_loop() and step() so that other runtimes can drive it (see
+    src.async_runtime).
+
+    Processing and rendering times, bytes written and input queue depth of every frame are recorded in the metrics of
+    the section, part of the metrics of the game it plays in (see use_metrics). Pressing F12 in any section toggles
+    an overlay showing them, in every section of that game.
     """
 
+    tick_rate: Optional[float] = None
+
     def __init__(self, in_queue: queue.Queue):
         self._in_queue = in_queue
         self._running = True
+        self.realtime = True
+        self.echo = FrameWriter()
+        self.timeline = Timeline()
+        # When the main loop should stop waiting for input and tick, None to wait for input only
+        self.next_tick: Optional[float] = None
+        self._last_advance = 0.0
+        self.use_metrics(Metrics())
+        # The time is read once when the section starts and once per step, and the input of every step is reported
+        # to on_input. Recording a game replaces both, replaying it replaces the clock (see src.util.recording)
+        self.clock: Callable[[], float] = time.monotonic
+        self.on_input: Optional[Callable[[Optional[Keystroke]], None]] = None
+
+    def use_metrics(self, game_metrics: Metrics) -> None:
+        """Record the frames of this section in the metrics of a game, shared by the sections of that game only"""
+        self.game_metrics = game_metrics
+        self.metrics = game_metrics.section(type(self).__name__)
 
     def __call__(self, terminal: Terminal, start_data: object):
         """Run the main loop for this game section"""
+        self.start_loop(terminal, start_data)
+
+        while self._running:
+            result = self.step(terminal, self._get_input(self.next_tick))
+            if result is not None:
+                return result
+
+        return self.handle_stop()
+
+    def start_loop(self, terminal: Terminal, start_data: object) -> None:
+        """Start the section, before the first step of its main loop"""
         self._running = True
+        self.echo.stream = terminal.stream
+        self.timeline.clear()
+        self.timeline.speed = 1.0 if self.realtime else math.inf
 
         if self.handle_start(start_data):
-            self.run_rendering(terminal, _echo)
+            self._render(terminal)
 
-        while self._running:
-            inp = self._get_input()
-
-            if inp == chr(3):
-                return EndGame()
+        # The first processing step happens straight away, with no input
+        self.next_tick = self.clock()
+        self._last_advance = self.next_tick
 
-            if self.run_processing(inp):
-                self.run_rendering(terminal, _echo)
+    def step(self, terminal: Terminal, inp: Optional[Keystroke]) -> Optional[EndGame]:
+        """Run one pass of the main loop with a keystroke, or None once the next tick is due
 
-        return self.handle_stop()
+        Returns EndGame if the game was interrupted. The loop runs while the section is running, waiting for input
+        until next_tick (forever when it is None) between steps.
+        """
+        if self.on_input is not None:
+            self.on_input(inp)
+        if inp == chr(3):
+            return EndGame()
+
+        now = self.clock()
+        if inp is None:
+            self.next_tick = self._schedule_tick(self.next_tick, now)
+        elif getattr(inp, 'name', None) == OVERLAY_KEY:
+            self._toggle_overlay(terminal)
+            return None
+        else:
+            self.metrics.queue_depth.record(self._in_queue.qsize())
+
+        # With no animation playing the section may not have stepped for a long time, an animation started now
+        # plays from its start rather than catching up on the time the section sat idle
+        animating = self.timeline.active
+        start = time.perf_counter()
+        render = self.run_processing(inp)
+        processing_time = time.perf_counter() - start
+        self.metrics.processing.record(processing_time)
+
+        if not animating:
+            self._last_advance = now
+        animate = self.timeline.advance(now - self._last_advance)
+        self._last_advance = now
+
+        if render or animate:
+            self._render(terminal, processing_time)
+
+        # A section may switch ticking on, or start an animation, while it is running
+        if self.next_tick is None and self._tick_rate():
+            self.next_tick = self._schedule_tick(None, now)
+        return None
+
+    @property
+    def running(self) -> bool:
+        """Whether the section is running, stop() ends its main loop"""
+        return self._running
 
     def stop(self) -> None:
         """Call to cease the running of the game section after a potential final render"""
@@ -90,8 +186,54 @@ class GameSection(ABC):
         """
         pass
 
-    def _get_input(self) -> Optional[str]:
+    def _render(self, terminal: Terminal, processing_time: float = 0.0) -> None:
+        """Render a frame and write it out with a single write"""
+        start = time.perf_counter()
+        self.run_rendering(terminal, self.echo)
+        self.timeline.run_due(terminal, self.echo)
+        if self.game_metrics.overlay_visible:
+            self.echo(render_overlay(terminal, type(self).__name__, self.metrics))
+        frame_bytes = self.echo.flush()
+        rendering_time = time.perf_counter() - start
+
+        self.metrics.rendering.record(rendering_time)
+        self.metrics.frame.record(processing_time + rendering_time)
+        self.metrics.bytes.record(frame_bytes)
+
+    def _toggle_overlay(self, terminal: Terminal) -> None:
+        """Show or hide the performance overlay, hiding it redraws the section underneath"""
+        self.game_metrics.overlay_visible = not self.game_metrics.overlay_visible
+        if self.game_metrics.overlay_visible:
+            self.echo(render_overlay(terminal, type(self).__name__, self.metrics))
+            self.echo.flush()
+        else:
+            self.echo(clear_overlay(terminal))
+            self._render(terminal)
+
+    def _schedule_tick(self, previous_tick: Optional[float], now: float) -> Optional[float]:
+        """Returns when the tick after previous_tick is due, skipping any ticks that were missed by now"""
+        tick_rate = self._tick_rate()
+        if not tick_rate:
+            return None
+
+        interval = 1 / tick_rate
+        next_tick = (now if previous_tick is None else previous_tick) + interval
+        if next_tick < now:
+            next_tick = now + interval
+        return next_tick
+
+    def _tick_rate(self) -> Optional[float]:
+        """The tick rate of the section, raised to the animation tick rate while an animation plays"""
+        if self.timeline.active:
+            return max(self.tick_rate or 0, ANIMATION_TICK_RATE)
+        return self.tick_rate
+
+    def _get_input(self, deadline: Optional[float] = None) -> Optional[str]:
+        """Wait for the next keystroke until the deadline, or forever if there is none"""
+        timeout = None if deadline is None else deadline - time.monotonic()
         try:
-            return self._in_queue.get_nowait()
+            if timeout is not None and timeout <= 0:
+                return self._in_queue.get_nowait()
+            return self._in_queue.get(timeout=timeout)
         except queue.Empty:
             return None
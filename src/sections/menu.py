@@ -7,7 +7,6 @@ from blessed.keyboard import Keystroke
 
 from src.commands import ChangeSection, EndGame
 from src.sections.base import GameSection
-from src.sections.over_world import StartOverWorld
 
 
 class MenuType:
@@ -36,6 +35,7 @@ class StartMenuBehaviour:
     title = 'Start Menu'
     menu_list = [
         'Play',
+        'Endless',
         'Character Select',
         'Quit',
     ]
@@ -54,13 +54,19 @@ class StartMenuBehaviour:
 
     def next_command(self, index: int, character: str) -> object:
         """Processes the next command after selection"""
+        # The over world is only imported once it is chosen, so the menu shows up without waiting for it
+        from src.sections.over_world import StartOverWorld
+
         if index == 0:
             return ChangeSection('over_world', StartOverWorld(character, True))
 
         if index == 1:
-            return ChangeSection('menu', CharacterMenuType(character))
+            return ChangeSection('over_world', StartOverWorld(character, True, endless=True))
 
         if index == 2:
+            return ChangeSection('menu', CharacterMenuType(character))
+
+        if index == 3:
             return EndGame()
 
 
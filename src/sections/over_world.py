@@ -1,3 +1,6 @@
+import random
+import struct
+import zlib
 from dataclasses import dataclass
 from queue import Queue
 from typing import Callable, Optional, Union
@@ -6,9 +9,12 @@ from blessed import Terminal
 from blessed.keyboard import Keystroke
 
 from src.commands import ChangeSection
-from src.GameObjects.game_objects import World
+from src.GameObjects.assets import ROOM_SIZE
+from src.GameObjects.game_objects import EndlessWorld, World
 from src.sections.base import GameSection
 from src.sections.question import NewQuestion, QuestionResult
+from src.util.level_pack import LEVEL_PACK_PATH, LevelPack, LevelPackError
+from src.util.renderer import CellRenderer
 
 _DEMO_MAZE = [
     [False, False, False, True, False],
@@ -25,6 +31,7 @@ class StartOverWorld:
 
     character: str
     reset_character: bool
+    endless: bool = False
 
 
 class OverWorld(GameSection):
@@ -32,12 +39,29 @@ class OverWorld(GameSection):
 
     def __init__(self, in_queue: Queue):
         super().__init__(in_queue)
-        world_maze = _DEMO_MAZE
-        self.world = World(world_maze)
+        self.world = self._load_world()
+        self.renderer = CellRenderer()
         self.npc = None
 
+    @staticmethod
+    def _load_world() -> World:
+        """Load a random level of the level pack, or the demo maze if there is no pack or it cannot be read"""
+        try:
+            level_pack = LevelPack(LEVEL_PACK_PATH)
+            if not len(level_pack):
+                return World(_DEMO_MAZE)
+            level = level_pack.level(random.randrange(len(level_pack)))
+        except (FileNotFoundError, LevelPackError, zlib.error, struct.error):
+            # A pack of an older format, or a truncated or corrupt one, is no reason not to play
+            return World(_DEMO_MAZE)
+        return level.world()
+
     def handle_start(self, start_data: Union[StartOverWorld, QuestionResult]) -> bool:
         """Inherit"""
+        if getattr(start_data, 'endless', False):
+            self.world.close()
+            self.world = EndlessWorld()
+
         try:
             reset_character = not start_data.was_correct
         except AttributeError:
@@ -67,6 +91,8 @@ class OverWorld(GameSection):
             pass
 
         self.npc = None
+        # The screen was cleared by the manager when this section started
+        self.renderer.invalidate()
 
         return True
 
@@ -101,8 +127,7 @@ class OverWorld(GameSection):
                     self.world.world_location[0] + {'up': -1, 'down': 1}.get(player_move_direction, 0),
                     self.world.world_location[1] + {'left': -1, 'right': 1}.get(player_move_direction, 0),
                 )
-                self.world.active_room.add_entity('player', player)
-                self.world.active_room.entity_dict['player'].update_location(
+                player.update_location(
                     *{'up': (5, 9), 'right': (1, 5), 'down': (5, 1), 'left': (9, 5)}[player_move_direction]
                 )
                 if self.world.completed:
@@ -114,8 +139,10 @@ class OverWorld(GameSection):
 
     def run_rendering(self, terminal: Terminal, echo: Callable[[str], None]) -> None:
         """Inherit"""
-        self.world.active_room.update_display()
-        self.world.active_room.render(terminal, echo)
+        room = self.world.active_room
+        rows = self.renderer.back_buffer(ROOM_SIZE, ROOM_SIZE)
+        room.draw(rows)
+        self.renderer.render(terminal, echo, rows, room)
 
     def handle_stop(self) -> object:
         """Inherit"""
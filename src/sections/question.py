@@ -1,19 +1,16 @@
-import time
 from dataclasses import dataclass
 from enum import IntEnum
 from pathlib import Path
 from queue import Queue
-from random import choice
 from string import ascii_uppercase
 from typing import Callable, Optional
 
 from blessed import Terminal
 from blessed.keyboard import Keystroke
-from pyfiglet import Figlet
 
 from src.commands import ChangeSection
 from src.sections.base import GameSection
-from src.util import question
+from src.util import banner, question, question_bank
 
 # Constants
 QUESTION_PATH = Path(__file__).parent / '..' / 'res/questions.json'
@@ -53,8 +50,7 @@ class Question(GameSection):
 
     def __init__(self, in_queue: Queue):
         super().__init__(in_queue)
-        self.questions_list = question.get_all_questions(QUESTION_PATH)
-        self.seen_questions = []
+        self.store = question_bank.open_store(QUESTION_PATH)
         self.state = QuestionScreenState.INITIAL
 
         # Initialize later
@@ -67,11 +63,14 @@ class Question(GameSection):
         self.start_y = 0
         self.selected_index = 0
         self.return_value = False
+        # Ids of the questions asked so far, in order
+        self.asked: list[str] = []
 
     def handle_start(self, start_data: NewQuestion) -> bool:
         """Inherit"""
         self.state = QuestionScreenState.INITIAL
         self.question = self._pick_question(start_data.question_prefix)
+        self.asked.append(self.question.id)
         self.selected_index = 0
         return False
 
@@ -80,11 +79,20 @@ class Question(GameSection):
         if self.state == QuestionScreenState.INITIAL:
             # Start writing the question to the screen
             self.state = QuestionScreenState.WRITING_QUESTION
-            return True
+            self._write_question()
+            return False
 
         if not inp:
             return False
 
+        if self.timeline.active:
+            # Any key fast-forwards the question being written or the answer being revealed
+            self.timeline.skip()
+            return False
+
+        if self.state != QuestionScreenState.USER_SELECTION:
+            return False
+
         if inp.name == 'KEY_UP':
             self.selected_index = (self.selected_index - 1) % len(self.question.choices)
             return True
@@ -95,96 +103,91 @@ class Question(GameSection):
 
         elif inp.name == 'KEY_ENTER':
             self.state = QuestionScreenState.REVEAL_ANSWER
+            self._write_answer()
             return True
 
         return False
 
     def run_rendering(self, terminal: Terminal, echo: Callable[[str], None]) -> None:
         """Inherit"""
-        if self.state == QuestionScreenState.WRITING_QUESTION:
-            return self._write_question(terminal, echo)
-
-        self._redraw(terminal, echo)
-
-        if self.state == QuestionScreenState.REVEAL_ANSWER:
-            return self._write_answer(terminal, echo)
+        # The question and the answer are drawn by the effects of the timeline
+        if self.state == QuestionScreenState.USER_SELECTION:
+            self._redraw(terminal, echo)
 
     def handle_stop(self) -> object:
         """Inherit"""
         return ChangeSection('over_world', QuestionResult(self.return_value))
 
     # Member Functions
-    def _write_question(self, terminal: Terminal, echo: Callable[[str], None]) -> None:
-        padding_unit = get_padding_unit(terminal)
-        self._draw_question_mark(terminal, echo)
-
-        # Write the question prompt
-        echo(terminal.move_xy(padding_unit, terminal.height // 4))
-        echo("●  ")
-        for ch in self.question.prompt:
-            echo(terminal.bold_red(ch))
-            time.sleep(1 / TYPING_SPEED)
-
-        # Write the choices
-        time.sleep(1)
-        echo(terminal.move_down(2))
+    def _write_question(self) -> None:
+        """Schedule the question mark, the question prompt typed out and the choices appearing one by one"""
+        self.timeline.then(self._draw_question_mark)
+        self.timeline.then(self._draw_bullet)
+        for i in range(len(self.question.prompt)):
+            self.timeline.then(lambda terminal, echo, i=i: self._draw_prompt_character(terminal, echo, i))
+            self.timeline.wait(1 / TYPING_SPEED)
+
+        self.timeline.wait(1)
+        for i in range(len(self.question.choices)):
+            self.timeline.then(lambda terminal, echo, i=i: self._draw_choice(terminal, echo, i))
+            self.timeline.wait(0.75)
+
+        self.timeline.then(self._start_selection)
+
+    def _draw_bullet(self, terminal: Terminal, echo: Callable[[str], None]) -> None:
         # termnial.get_location() doesn't seem to be working in multithreaded,
         # so we assume the question is only 1 line long
         self.start_y = (terminal.height // 4) + 2
-
-        for i, choice_ in enumerate(self.question.choices):
-            echo(terminal.move_x(padding_unit * 2) + terminal.move_down(1))
-            echo((
-                f"{terminal.bold_cyan}{ascii_uppercase[i]}."
-                f" {terminal.normal + terminal.lawngreen}{choice_}"
-            ))
-            time.sleep(0.75)
-
+        echo(terminal.move_xy(get_padding_unit(terminal), terminal.height // 4) + "●  ")
+
+    def _draw_prompt_character(self, terminal: Terminal, echo: Callable[[str], None], index: int) -> None:
+        # Characters are placed where the terminal would have wrapped them, as something else may have moved the cursor
+        offset = get_padding_unit(terminal) + len("●  ") + index
+        y = terminal.height // 4 + offset // terminal.width
+        echo(terminal.move_xy(offset % terminal.width, y) + terminal.bold_red(self.question.prompt[index]))
+
+    def _draw_choice(self, terminal: Terminal, echo: Callable[[str], None], index: int) -> None:
+        echo(terminal.move_xy(get_padding_unit(terminal) * 2, self.start_y + 1 + index))
+        echo((
+            f"{terminal.bold_cyan}{ascii_uppercase[index]}."
+            f" {terminal.normal + terminal.lawngreen}{self.question.choices[index]}"
+        ))
+
+    def _start_selection(self, terminal: Terminal, echo: Callable[[str], None]) -> None:
         self.state = QuestionScreenState.USER_SELECTION
         self._redraw(terminal, echo)
 
     @staticmethod
     def _draw_question_mark(terminal: Terminal, echo: Callable[[str], None]) -> None:
-        figlet = Figlet(font='doh', justify='right', width=terminal.width)
-        render = figlet.renderText("?")
-        cleaned = "\n".join(line for line in render.split("\n") if not line.isspace())
-        padding = (terminal.height - cleaned.count("\n")) // 2
+        question_mark = banner.render("?", font='doh', justify='right', width=terminal.width)
+        padding = (terminal.height - question_mark.height) // 2
         echo(
             terminal.home
             + terminal.snow4
             + "\n" * padding
-            + cleaned
+            + question_mark.text
             + terminal.normal
         )
 
-    def _write_answer(self, terminal: Terminal, echo: Callable[[str], None]) -> None:
-        correct = self.question.is_index_correct(self.selected_index)
-        if correct:
+    def _write_answer(self) -> None:
+        """Schedule the answer reveal, then leave the question screen a few seconds later"""
+        self.return_value = self.question.is_index_correct(self.selected_index)
+        self.timeline.then(self._draw_answer)
+        self.timeline.wait(3)
+        self.timeline.then(lambda terminal, echo: self.stop())
+
+    def _draw_answer(self, terminal: Terminal, echo: Callable[[str], None]) -> None:
+        self._redraw(terminal, echo)
+        if self.return_value:
             self._write_footer(terminal, echo, terminal.white + "▶" + terminal.bold_green + "  CORRECT!!")
         else:
             self._write_footer(terminal, echo, terminal.white + "▶" + terminal.bold_red + "  INCORRECT!!")
-
-        time.sleep(3)
-        self.return_value = correct
         echo(terminal.normal)
-        self.stop()
 
     def _pick_question(self, question_prefix: Optional[str]) -> question.Question:
-        if self.questions_list == []:
-            self.questions_list = self.seen_questions
-            self.seen_questions = []
-
-        # if data is a string, pick a question that matches .startswith()
-        if question_prefix is not None:
-            chosen_question = choice([q for q in self.questions_list if q.id.startswith(question_prefix)])
-        else:
-            # Otherwise, return a random non-special question
-            chosen_question = choice([q for q in self.questions_list if not q.id.startswith('special-')])
-
-        self.seen_questions.append(chosen_question)
-        self.questions_list.remove(chosen_question)
-
-        return chosen_question
+        # A prefix picks a question whose id starts with it, otherwise a random non-special question is picked.
+        # Each prefix draws without replacement until all of its questions have been seen.
+        return self.store.draw(question_prefix)
 
     def _redraw(self, terminal: Terminal, echo: Callable[[str], None]) -> None:
         # Redraw the questions (A different one might be selected)
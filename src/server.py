@@ -0,0 +1,213 @@
+"""Server hosting many games at once over telnet style connections, all in one process
+
+Every connection gets its own GameManager, so its own World, Question state and a terminal bound to the connection,
+and all of them run on one asyncio event loop (see src.async_runtime). The read-only assets (room templates, object
+representations, questions and banners) are loaded once per process and shared by every session.
+
+    python -m src.server --port 2323
+    telnet localhost 2323
+"""
+import asyncio
+import codecs
+from argparse import ArgumentParser
+
+from blessed.keyboard import Keystroke, resolve_sequence
+
+from src.headless import VirtualTerminal
+from src.manager import GameManager
+
+# Telnet commands and options used to put the client in character mode and learn its window size
+IAC, DONT, DO, WONT, WILL, SB, SE = 255, 254, 253, 252, 251, 250, 240
+ECHO, SUPPRESS_GO_AHEAD, LINEMODE, NAWS = 1, 3, 34, 31
+NEGOTIATION = bytes([IAC, WILL, ECHO, IAC, WILL, SUPPRESS_GO_AHEAD, IAC, DONT, LINEMODE, IAC, DO, NAWS])
+
+# Ctrl+C, sent to the session when its connection is lost so that the game ends
+INTERRUPT = chr(3)
+
+# Bytes a client may leave unread, a few hundred full frames, before its connection is closed
+WRITE_BUFFER_LIMIT = 1 << 20
+
+
+class ConnectionStream:
+    """A text stream writing to a connection, without blocking: the transport buffers what the client has not read
+
+    A client not reading what it is sent would have the transport buffer frames without end. Once more than
+    WRITE_BUFFER_LIMIT bytes are waiting the connection is dropped instead, which ends the session as if the client had
+    gone away. Frames are not dropped, as the next ones only redraw what changed and would leave the screen broken.
+    """
+
+    encoding = 'utf8'
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.bytes_written = 0
+
+    def write(self, text: str) -> int:
+        """Send text to the client, or close the connection if the client is too far behind"""
+        data = text.encode(self.encoding)
+        self.bytes_written += len(data)
+        if not self.writer.is_closing():
+            if self.writer.transport.get_write_buffer_size() + len(data) > WRITE_BUFFER_LIMIT:
+                # Closing would wait for the buffer to drain, which a client not reading never lets happen
+                self.writer.transport.abort()
+            else:
+                self.writer.write(data)
+        return len(text)
+
+    def flush(self) -> None:
+        """Everything written is already handed to the transport"""
+        pass
+
+
+class SessionTerminal(VirtualTerminal):
+    """The terminal of a connection, its size follows the window size the client reports"""
+
+    def __init__(self, stream: ConnectionStream, width: int = 80, height: int = 24):
+        super().__init__(width, height, stream)
+        self._pending = ''
+
+    def resize(self, width: int, height: int) -> None:
+        """Change the size of the terminal"""
+        if width and height:
+            self._virtual_size = (width, height)
+
+    def feed(self, text: str) -> list[Keystroke]:
+        """Decode the keystrokes in text, keeping an incomplete escape sequence for the next call"""
+        # Telnet clients send Enter as CR NUL or CR LF
+        text = (self._pending + text).replace('\r\0', '\r').replace('\r\n', '\r')
+        keystrokes = []
+        while text:
+            if text in self._keymap_prefixes:
+                # The rest of the escape sequence has not arrived yet
+                break
+            keystroke = resolve_sequence(text, self._keymap, self._keycodes)
+            keystrokes.append(keystroke)
+            text = text[max(len(keystroke), 1):]
+        self._pending = text
+        return keystrokes
+
+
+class TelnetDecoder:
+    """Splits what a telnet client sends into plain input and option negotiations, reporting window sizes"""
+
+    def __init__(self, session_terminal: SessionTerminal):
+        self.terminal = session_terminal
+        self._buffer = bytearray()
+        # Keeps the bytes of a character split across reads for the next call
+        self._decoder = codecs.getincrementaldecoder('utf8')('replace')
+
+    def feed(self, data: bytes) -> str:
+        """Returns the input typed in data, handling the telnet commands in it"""
+        self._buffer += data
+        buffer = self._buffer
+        text = bytearray()
+        index = 0
+        while index < len(buffer):
+            byte = buffer[index]
+            if byte != IAC:
+                text.append(byte)
+                index += 1
+                continue
+
+            if index + 1 >= len(buffer):
+                break
+            command = buffer[index + 1]
+            if command == IAC:
+                text.append(IAC)
+                index += 2
+            elif command in (DO, DONT, WILL, WONT):
+                if index + 2 >= len(buffer):
+                    break
+                index += 3
+            elif command == SB:
+                end = buffer.find(bytes([IAC, SE]), index + 2)
+                if end == -1:
+                    break
+                self._subnegotiation(bytes(buffer[index + 2:end]))
+                index = end + 2
+            else:
+                index += 2
+
+        del buffer[:index]
+        return self._decoder.decode(bytes(text))
+
+    def _subnegotiation(self, payload: bytes) -> None:
+        payload = payload.replace(bytes([IAC, IAC]), bytes([IAC]))
+        if len(payload) == 5 and payload[0] == NAWS:
+            self.terminal.resize(int.from_bytes(payload[1:3], 'big'), int.from_bytes(payload[3:5], 'big'))
+
+
+class Session:
+    """A game played over one connection"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, manager_cls: type = GameManager):
+        self.reader = reader
+        self.writer = writer
+        self.terminal = SessionTerminal(ConnectionStream(writer))
+        self.in_queue = asyncio.Queue()
+        self.manager = manager_cls(self.in_queue, self.terminal)
+
+    async def run(self) -> None:
+        """Play the game until it ends or the client goes away"""
+        self.writer.write(NEGOTIATION)
+        reader_task = asyncio.ensure_future(self._read_input())
+        try:
+            await self.manager.run_async()
+        finally:
+            reader_task.cancel()
+            self.writer.close()
+
+    async def _read_input(self) -> None:
+        decoder = TelnetDecoder(self.terminal)
+        while True:
+            data = await self.reader.read(4096)
+            if not data:
+                self.in_queue.put_nowait(self.terminal.keystroke(INTERRUPT))
+                return
+            for keystroke in self.terminal.feed(decoder.feed(data)):
+                self.in_queue.put_nowait(keystroke)
+
+
+class GameServer:
+    """Accepts connections and runs a session for each of them"""
+
+    def __init__(self, manager_cls: type = GameManager):
+        self.manager_cls = manager_cls
+        self.sessions: set[Session] = set()
+        self.completed = 0
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Run the session of a new connection"""
+        session = Session(reader, writer, self.manager_cls)
+        self.sessions.add(session)
+        try:
+            await session.run()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions.discard(session)
+            self.completed += 1
+
+    async def serve(self, host: str, port: int) -> None:
+        """Serve games until cancelled"""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main() -> None:
+    """Run the game server"""
+    parser = ArgumentParser(description='Host games for telnet clients')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=2323)
+    args = parser.parse_args()
+
+    print(f"serving games on {args.host}:{args.port}", flush=True)
+    try:
+        asyncio.run(GameServer().serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
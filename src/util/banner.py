@@ -0,0 +1,104 @@
+"""Cache of the Figlet banners drawn by the game sections
+
+Rendering a banner with pyfiglet takes milliseconds and importing pyfiglet takes longer, so banners are cleaned of
+their blank lines and cached per (font, text, justify, width). pyfiglet is only imported the first time a banner
+misses the cache.
+
+Banners for common terminal widths can be pre-rendered into a file so that the game never needs pyfiglet for them:
+
+    python -m src.util.banner
+"""
+import json
+import os
+import threading
+from argparse import ArgumentParser
+from functools import lru_cache
+from pathlib import Path
+from typing import Mapping, NamedTuple, Optional
+
+PRERENDERED_PATH = Path(__file__).parent / '..' / 'res/banners.json'
+COMMON_WIDTHS = (80, 100, 120, 132, 160, 200, 240)
+# The banners drawn by the game, as (font, text, justify)
+GAME_BANNERS = (('doh', '?', 'right'),)
+
+_prerendered_lock = threading.Lock()
+_prerendered: Optional[Mapping[str, str]] = None
+
+
+class Banner(NamedTuple):
+    """Rendered banner text, without blank lines, and the number of lines it spans"""
+
+    text: str
+    height: int
+
+
+def _key(font: str, text: str, justify: str, width: int) -> str:
+    return json.dumps([font, text, justify, width])
+
+
+def _load_prerendered(file_path: os.PathLike = PRERENDERED_PATH) -> Mapping[str, str]:
+    global _prerendered
+    with _prerendered_lock:
+        if _prerendered is None:
+            try:
+                with open(file_path, 'r', encoding='utf8') as file:
+                    _prerendered = json.load(file)
+            except FileNotFoundError:
+                _prerendered = {}
+        return _prerendered
+
+
+def _clean(render: str) -> Banner:
+    lines = [line for line in render.split("\n") if line and not line.isspace()]
+    return Banner("\n".join(lines), len(lines))
+
+
+def _figlet_render(font: str, text: str, justify: str, width: int) -> str:
+    from pyfiglet import Figlet
+
+    return Figlet(font=font, justify=justify, width=width).renderText(text)
+
+
+@lru_cache(maxsize=256)
+def render(text: str, font: str = 'standard', justify: str = 'auto', width: int = 80) -> Banner:
+    """Returns the banner of text in a Figlet font, from the cache, the pre-rendered banners or pyfiglet"""
+    prerendered = _load_prerendered().get(_key(font, text, justify, width))
+    if prerendered is not None:
+        return _clean(prerendered)
+    return _clean(_figlet_render(font, text, justify, width))
+
+
+def clear_cache() -> None:
+    """Forget every rendered banner and the pre-rendered file"""
+    global _prerendered
+    render.cache_clear()
+    with _prerendered_lock:
+        _prerendered = None
+
+
+def prerender(file_path: os.PathLike = PRERENDERED_PATH, widths: tuple[int, ...] = COMMON_WIDTHS) -> int:
+    """Render the game's banners for the given terminal widths into a file, returns the number of banners"""
+    banners = {
+        _key(font, text, justify, width): _clean(_figlet_render(font, text, justify, width)).text
+        for font, text, justify in GAME_BANNERS
+        for width in widths
+    }
+    with open(file_path, 'w', encoding='utf8') as file:
+        json.dump(banners, file, ensure_ascii=False, indent=0)
+    clear_cache()
+    return len(banners)
+
+
+def main() -> None:
+    """Pre-render the game's banners"""
+    parser = ArgumentParser(description="Pre-render the game's Figlet banners for common terminal widths")
+    parser.add_argument('--output', type=Path, default=PRERENDERED_PATH)
+    parser.add_argument('--widths', type=int, nargs='+', default=COMMON_WIDTHS)
+    args = parser.parse_args()
+
+    count = prerender(args.output, tuple(args.widths))
+    print(f"wrote {count} banners to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
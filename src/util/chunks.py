@@ -0,0 +1,116 @@
+"""Endless mazes made of chunks stacked top to bottom, generated ahead of the player on a background thread
+
+Every chunk is an ordinary maze from src.util.maze, `width` cells wide and `chunk_height` cells tall. The exit of a
+chunk and the entrance of the chunk below it are in the same column, so the rows of consecutive chunks join up into
+one endless maze. That column only depends on the seed and the position of the boundary, which makes every chunk a
+function of the seed and its index alone: chunks far from the player are dropped, and generated again identically if
+the player comes back to them.
+"""
+import random
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from src.util.maze import Maze, generate, open_sides
+from src.util.solver import DistanceField
+
+# Chunks generated below the chunk the player is in, and kept above it
+CHUNKS_AHEAD = 2
+CHUNKS_BEHIND = 1
+
+
+def boundary_column(seed: int, boundary: int, width: int) -> int:
+    """The column where chunk boundary - 1 leaves and chunk boundary starts, boundary 0 is the top of the maze"""
+    return random.Random(f"{seed}:boundary:{boundary}").randrange(1, width - 1)
+
+
+def generate_chunk(seed: int, index: int, width: int, chunk_height: int) -> Maze:
+    """Generate a chunk of an endless maze"""
+    return generate(
+        width,
+        chunk_height,
+        rng=random.Random(f"{seed}:chunk:{index}"),
+        entrance_x=boundary_column(seed, index, width),
+        exit_x=boundary_column(seed, index + 1, width),
+    )
+
+
+class ChunkedMaze:
+    """An endless maze indexed by row then column, like a Maze, whose chunks are generated around the player
+
+    focus() tells the maze which row the player is on: the chunks from CHUNKS_BEHIND above to CHUNKS_AHEAD below
+    are kept, the ones below are generated ahead on a background thread and every other chunk is dropped. Reading a
+    row of a chunk that is not ready waits for it, which only happens when a chunk is revisited after being dropped.
+    """
+
+    def __init__(self, width: int, chunk_height: int, seed: int):
+        if chunk_height < 3:
+            raise ValueError('A chunk needs to be at least 3 rows tall')
+        self.width = width
+        self.chunk_height = chunk_height
+        self.seed = seed
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='maze-chunks')
+        self._chunks: dict[int, Future] = {}
+        self._fields: dict[int, DistanceField] = {}
+        self.focus(0)
+
+    @property
+    def entrance_index(self) -> int:
+        """The column of the entrance on the top row"""
+        return boundary_column(self.seed, 0, self.width)
+
+    def focus(self, row_index: int) -> None:
+        """Keep the chunks around a row, generating the ones ahead of it and dropping the others"""
+        current = max(row_index, 0) // self.chunk_height
+        wanted = range(max(current - CHUNKS_BEHIND, 0), current + CHUNKS_AHEAD + 1)
+
+        for index in list(self._chunks):
+            if index not in wanted:
+                self._chunks.pop(index).cancel()
+                self._fields.pop(index, None)
+
+        for index in wanted:
+            if index not in self._chunks:
+                self._chunks[index] = self._executor.submit(
+                    generate_chunk, self.seed, index, self.width, self.chunk_height
+                )
+
+    def chunk(self, index: int) -> Maze:
+        """Returns a chunk, generating it on this thread if it is not kept"""
+        future = self._chunks.get(index)
+        if future is None:
+            return generate_chunk(self.seed, index, self.width, self.chunk_height)
+        return future.result()
+
+    def distance_field(self, index: int) -> DistanceField:
+        """Returns the distance field of a chunk, to its exit"""
+        field = self._fields.get(index)
+        if field is None:
+            field = DistanceField(self.chunk(index))
+            if index in self._chunks:
+                self._fields[index] = field
+        return field
+
+    def is_open(self, x: int, y: int) -> bool:
+        """Returns whether the cell at (x, y) is a floor"""
+        if y < 0 or not 0 <= x < self.width:
+            return False
+        index, chunk_row = divmod(y, self.chunk_height)
+        return self.chunk(index).is_open(x, chunk_row)
+
+    def side_mask(self, x: int, y: int) -> int:
+        """The side mask of the open neighbours of the cell at (x, y), 0 for a wall, see src.util.maze"""
+        return open_sides(self.is_open, x, y)
+
+    @property
+    def chunks_kept(self) -> int:
+        """The number of chunks in memory or being generated"""
+        return len(self._chunks)
+
+    def close(self, wait: bool = False) -> None:
+        """Stop generating chunks"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def __getitem__(self, row_index: int) -> bytes:
+        if row_index < 0:
+            raise IndexError('maze row out of range')
+        index, chunk_row = divmod(row_index, self.chunk_height)
+        return self.chunk(index)[chunk_row]
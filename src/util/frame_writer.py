@@ -0,0 +1,58 @@
+"""This module contains the frame writer that batches terminal output."""
+import io
+import os
+import sys
+from typing import Optional, TextIO
+
+
+class FrameWriter:
+    """Collects everything echoed during a frame and writes it to the stream in one go
+
+    Calling the writer appends to the current frame, flush() sends the frame with a single write to the stream's
+    file descriptor (or a single write() call when the stream has none). Sections that animate can call flush() in
+    the middle of a frame to show what has been echoed so far.
+
+    The writer counts the write calls it makes and the bytes it sends, so the effect of batching can be measured.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+        self.writes = 0
+        self.bytes_written = 0
+        self.flushes = 0
+        self._parts: list[str] = []
+
+    def __call__(self, text: object) -> None:
+        """Add text to the current frame"""
+        self._parts.append(str(text))
+
+    def flush(self) -> int:
+        """Write out everything echoed since the last flush and return the number of bytes written"""
+        if not self._parts:
+            return 0
+
+        stream = sys.stdout if self.stream is None else self.stream
+        text = "".join(self._parts)
+        self._parts.clear()
+        data = text.encode(getattr(stream, 'encoding', None) or 'utf8')
+
+        try:
+            file_descriptor = stream.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            file_descriptor = None
+
+        if file_descriptor is None:
+            stream.write(text)
+            stream.flush()
+            self.writes += 1
+        else:
+            # Anything printed straight to the stream has to reach the terminal before this frame
+            stream.flush()
+            view = memoryview(data)
+            while view:
+                view = view[os.write(file_descriptor, view):]
+                self.writes += 1
+
+        self.bytes_written += len(data)
+        self.flushes += 1
+        return len(data)
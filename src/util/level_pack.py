@@ -0,0 +1,151 @@
+"""Level packs: worlds generated ahead of time and stored in a compact binary file
+
+A pack holds a number of levels, each with its seed, its maze and the plan of every room (type, rotation, template,
+NPC placement and representation), so loading a level needs no generation at all. Levels are derived from a master
+seed independently of each other, which makes packs reproducible however many processes generate them.
+
+File layout, integers little endian:
+
+    magic b'TLP2', u32 level count, u64 master seed
+    u64 offset and u32 length of every level record
+    the level records, each compressed with zlib:
+        u64 seed, u16 width, u16 height
+        the bits of the maze as the Maze holds them: one bit per cell row by row, cell i is bit i % 8 of byte
+        i // 8, the last byte padded with zeros
+        u32 room count, then for every room: u16 row, u16 column, u8 type and rotation, u8 template,
+        u8 NPC placement, u8 NPC representation
+"""
+import os
+import random
+import struct
+import zlib
+from pathlib import Path
+from typing import NamedTuple
+
+from src.GameObjects.assets import ROOM_TYPES
+from src.GameObjects.game_objects import RoomChoices, RoomPlan, World
+from src.util import maze
+
+LEVEL_PACK_PATH = Path(__file__).parent / '..' / 'res/levels.pack'
+
+_MAGIC = b'TLP2'
+_HEADER = struct.Struct('<4sIQ')
+_ENTRY = struct.Struct('<QI')
+_LEVEL_HEADER = struct.Struct('<QHH')
+_ROOM_COUNT = struct.Struct('<I')
+_ROOM = struct.Struct('<HHBBBB')
+
+
+class LevelPackError(ValueError):
+    """Raised when a level pack is malformed"""
+
+
+class Level(NamedTuple):
+    """A world generated ahead of time"""
+
+    seed: int
+    maze: maze.Maze
+    room_plans: dict[tuple[int, int], RoomPlan]
+
+    def world(self) -> World:
+        """Build the world of the level, its rooms are built from their plans"""
+        return World(self.maze, self.seed, room_plans=self.room_plans)
+
+
+def level_seed(master_seed: int, index: int) -> int:
+    """The seed of a level of a pack, only depending on the master seed and the position of the level"""
+    return random.Random(f"{master_seed}:{index}").getrandbits(64)
+
+
+def generate_level(seed: int, width: int, height: int) -> Level:
+    """Generate the maze of a level from its seed and plan all of its rooms"""
+    maze_matrix = maze.generate(width, height, rng=random.Random(seed))
+    world = World(maze_matrix, seed)
+
+    return Level(seed, maze_matrix, world.plan_rooms())
+
+
+def generate_record(seed: int, width: int, height: int) -> bytes:
+    """Generate a level and return its encoded record, this is what the workers of a process pool run"""
+    return encode_level(generate_level(seed, width, height))
+
+
+def encode_level(level: Level) -> bytes:
+    """Serialise a level into a compressed level record"""
+    parts = [
+        _LEVEL_HEADER.pack(level.seed, level.maze.width, level.maze.height),
+        level.maze.bits,
+        _ROOM_COUNT.pack(len(level.room_plans)),
+    ]
+    for (row_index, column_index), plan in level.room_plans.items():
+        parts.append(_ROOM.pack(
+            row_index,
+            column_index,
+            ROOM_TYPES.index(plan.room_type) << 2 | plan.rotation // 90,
+            *plan.choices,
+        ))
+    return zlib.compress(b''.join(parts), 9)
+
+
+def decode_level(record: bytes) -> Level:
+    """Read a level back from a compressed level record"""
+    data = zlib.decompress(record)
+    seed, width, height = _LEVEL_HEADER.unpack_from(data)
+
+    offset = _LEVEL_HEADER.size
+    maze_size = (width * height + 7) // 8
+    try:
+        maze_matrix = maze.Maze(width, height, data[offset:offset + maze_size])
+    except ValueError as error:
+        raise LevelPackError(f"Level maze is truncated: {error}") from None
+    offset += maze_size
+
+    room_count, = _ROOM_COUNT.unpack_from(data, offset)
+    offset += _ROOM_COUNT.size
+    room_plans = {}
+    for row_index, column_index, type_rotation, *choices in _ROOM.iter_unpack(
+            data[offset:offset + room_count * _ROOM.size]
+    ):
+        room_plans[row_index, column_index] = RoomPlan(
+            ROOM_TYPES[type_rotation >> 2],
+            (type_rotation & 3) * 90,
+            RoomChoices(*choices),
+        )
+    return Level(seed, maze_matrix, room_plans)
+
+
+def write_pack(file_path: os.PathLike, master_seed: int, records: list[bytes]) -> None:
+    """Write encoded level records into a level pack"""
+    offset = _HEADER.size + _ENTRY.size * len(records)
+    with open(file_path, 'wb') as file:
+        file.write(_HEADER.pack(_MAGIC, len(records), master_seed))
+        for record in records:
+            file.write(_ENTRY.pack(offset, len(record)))
+            offset += len(record)
+        for record in records:
+            file.write(record)
+
+
+class LevelPack:
+    """Read access to the levels of a pack, a level is only read and decoded when it is loaded"""
+
+    def __init__(self, file_path: os.PathLike = LEVEL_PACK_PATH):
+        self.file_path = Path(file_path)
+        with open(self.file_path, 'rb') as file:
+            header = file.read(_HEADER.size)
+            if len(header) != _HEADER.size or header[:4] != _MAGIC:
+                raise LevelPackError(f"{self.file_path} is not a level pack")
+            _, count, self.master_seed = _HEADER.unpack(header)
+            self._entries = list(_ENTRY.iter_unpack(file.read(_ENTRY.size * count)))
+        if len(self._entries) != count:
+            raise LevelPackError(f"{self.file_path} is truncated")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def level(self, index: int) -> Level:
+        """Load a level of the pack"""
+        offset, length = self._entries[index]
+        with open(self.file_path, 'rb') as file:
+            file.seek(offset)
+            return decode_level(file.read(length))
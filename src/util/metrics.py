@@ -0,0 +1,135 @@
+"""This module contains the frame timing instrumentation of the game sections."""
+import json
+import math
+import os
+from typing import Optional
+
+from blessed import Terminal
+
+# Key toggling the performance overlay, and the size of the overlay
+OVERLAY_KEY = 'KEY_F12'
+OVERLAY_WIDTH = 48
+OVERLAY_HEIGHT = 6
+
+
+class Histogram:
+    """Fixed size histogram with logarithmic buckets
+
+    Values are counted in buckets spaced geometrically between low and high, values outside of that range land in the
+    first or last bucket. Recording a value is O(1) and the memory used never grows.
+    """
+
+    def __init__(self, low: float, high: float, buckets: int = 64):
+        self.low = low
+        self.high = high
+        self.counts = [0] * buckets
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self._scale = (buckets - 1) / math.log(high / low)
+
+    def record(self, value: float) -> None:
+        """Count a value"""
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+        if value <= self.low:
+            bucket = 0
+        else:
+            bucket = min(int(math.log(value / self.low) * self._scale) + 1, len(self.counts) - 1)
+        self.counts[bucket] += 1
+
+    def bucket_bound(self, bucket: int) -> float:
+        """The upper bound of the values counted in a bucket"""
+        return self.low * math.exp(bucket / self._scale)
+
+    def percentile(self, percent: float) -> float:
+        """The value below which percent of the recorded values fall, to the precision of a bucket"""
+        if not self.count:
+            return 0.0
+
+        rank = self.count * percent / 100
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.bucket_bound(bucket), self.maximum)
+        return self.maximum
+
+    def to_dict(self) -> dict:
+        """A JSON serialisable summary of the histogram"""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.maximum,
+            'low': self.low,
+            'high': self.high,
+            'counts': self.counts,
+        }
+
+
+class SectionMetrics:
+    """Frame timings of a game section, times are in seconds"""
+
+    def __init__(self):
+        self.processing = Histogram(1e-6, 10)
+        self.rendering = Histogram(1e-6, 10)
+        self.frame = Histogram(1e-6, 10)
+        self.bytes = Histogram(1, 1e7)
+        self.queue_depth = Histogram(1, 1e4, 32)
+
+    def to_dict(self) -> dict:
+        """A JSON serialisable summary of the metrics"""
+        return {name: histogram.to_dict() for name, histogram in vars(self).items()}
+
+
+class Metrics:
+    """The metrics of every game section, and whether the performance overlay is shown"""
+
+    def __init__(self):
+        self.sections: dict[str, SectionMetrics] = {}
+        self.overlay_visible = False
+
+    def section(self, name: str) -> SectionMetrics:
+        """Returns the metrics of a section, creating them if needed"""
+        try:
+            return self.sections[name]
+        except KeyError:
+            self.sections[name] = SectionMetrics()
+            return self.sections[name]
+
+    def dump(self, file_path: os.PathLike) -> None:
+        """Write the metrics of every section to a JSON file"""
+        with open(file_path, 'w', encoding='utf8') as file:
+            json.dump({name: metrics.to_dict() for name, metrics in self.sections.items()}, file, indent=2)
+
+
+def render_overlay(terminal: Terminal, name: str, metrics: Optional[SectionMetrics]) -> str:
+    """Returns the performance overlay of a section, drawn over the top left corner of the screen"""
+    lines = [f" {name} ", " no frames yet "]
+    if metrics is not None and metrics.frame.count:
+        lines[1:] = [
+            _timing_line("frame", metrics.frame),
+            _timing_line("process", metrics.processing),
+            _timing_line("render", metrics.rendering),
+            f" bytes   p50 {metrics.bytes.percentile(50):7.0f}     p99 {metrics.bytes.percentile(99):7.0f}",
+            f" queue   max {metrics.queue_depth.maximum:7.0f}  frames {metrics.frame.count:9d}",
+        ]
+
+    return "".join(
+        terminal.move_xy(0, y) + terminal.black_on_yellow(line.ljust(OVERLAY_WIDTH))
+        for y, line in enumerate(lines)
+    ) + terminal.normal
+
+
+def _timing_line(label: str, histogram: Histogram) -> str:
+    return f" {label:7} p50 {histogram.percentile(50) * 1e3:7.2f} ms  p99 {histogram.percentile(99) * 1e3:7.2f} ms"
+
+
+def clear_overlay(terminal: Terminal) -> str:
+    """Returns the blanks covering where the performance overlay was drawn"""
+    return terminal.normal + "".join(terminal.move_xy(0, y) + " " * OVERLAY_WIDTH for y in range(OVERLAY_HEIGHT))
@@ -1,7 +1,14 @@
 """This module contains utilities for the Questions GameSection."""
 import os
+import random
+from array import array
+from bisect import bisect_left
 from dataclasses import dataclass
 from json import load
+from typing import Callable, Optional, Sequence
+
+# Questions with this id prefix are only drawn when asked for explicitly
+SPECIAL_PREFIX = 'special-'
 
 
 @dataclass
@@ -37,3 +44,85 @@ def get_all_questions(fp: os.PathLike) -> list[Question]:
         contents = load(f)
 
     return gather_questions(contents)
+
+
+class QuestionStore:
+    """Question bank indexed by id, drawing questions at random without replacement
+
+    The ids are kept sorted, so the questions sharing an id prefix form a contiguous range found by binary search.
+    Every prefix gets its own pool of positions, built on first use. Drawing swaps a random remaining position to the
+    end of the pool (a partial Fisher-Yates shuffle), so each draw is O(1). A pool starts over once it is used up.
+
+    Questions are only loaded when they are drawn, through the load callable taking a position in the sorted order.
+    """
+
+    def __init__(
+            self,
+            sorted_ids: Sequence[str],
+            load: Callable[[int], Question],
+            rng: Optional[random.Random] = None,
+    ):
+        self.ids = sorted_ids
+        self._load = load
+        self._rng = random if rng is None else rng
+        self._pools: dict[Optional[str], _Pool] = {}
+
+    @classmethod
+    def from_questions(cls, questions: list[Question], rng: Optional[random.Random] = None) -> 'QuestionStore':
+        """Builds a store holding a list of questions in memory"""
+        ordered = sorted(questions, key=lambda q: q.id)
+        return cls([q.id for q in ordered], ordered.__getitem__, rng)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def prefix_range(self, prefix: str) -> range:
+        """Returns the positions of the questions whose id starts with prefix"""
+        if not prefix:
+            return range(len(self.ids))
+        # Every id starting with the prefix sorts before the prefix with its last character incremented
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        start = bisect_left(self.ids, prefix)
+        end = bisect_left(self.ids, upper, start)
+        return range(start, end)
+
+    def draw(self, question_prefix: Optional[str] = None) -> Question:
+        """Draws a question whose id starts with question_prefix, or a non-special question if there is no prefix"""
+        try:
+            pool = self._pools[question_prefix]
+        except KeyError:
+            pool = self._pools[question_prefix] = self._build_pool(question_prefix)
+
+        if not pool.positions:
+            raise LookupError(f"There are no questions for the prefix {question_prefix!r}")
+
+        return self._load(pool.draw(self._rng))
+
+    def _build_pool(self, question_prefix: Optional[str]) -> '_Pool':
+        if question_prefix is not None:
+            return _Pool(array('l', self.prefix_range(question_prefix)))
+
+        special = self.prefix_range(SPECIAL_PREFIX)
+        positions = array('l', range(special.start))
+        positions.extend(range(special.stop, len(self.ids)))
+        return _Pool(positions)
+
+
+class _Pool:
+    """Positions of the questions of a prefix, the ones not drawn yet come first"""
+
+    def __init__(self, positions: array):
+        self.positions = positions
+        self.remaining = len(positions)
+
+    def draw(self, rng: random.Random) -> int:
+        if not self.remaining:
+            self.remaining = len(self.positions)
+
+        index = int(rng.random() * self.remaining)
+        self.remaining -= 1
+        positions = self.positions
+        position = positions[index]
+        positions[index] = positions[self.remaining]
+        positions[self.remaining] = position
+        return position
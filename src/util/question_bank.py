@@ -0,0 +1,213 @@
+"""Streaming question bank format for very large banks
+
+A bank is a JSON Lines file holding one question per line, next to a binary index (the same path with `.idx`
+appended). The index lists the question ids in sorted order together with the byte range of each question's line, so
+the ids can be binary searched and a question decoded from its line only when it is drawn. Both files are memory
+mapped, so opening a bank costs the same whatever its size.
+
+Index layout, integers in native byte order:
+
+    magic b'QBI1', u32 count
+    u64 line start and u64 line end of every question, in id order
+    u32 offset of every id in the id blob, plus the end of the blob
+    the ids, utf8 encoded and concatenated in sorted order
+
+Convert an existing JSON bank with:
+
+    python -m src.util.question_bank src/res/questions.json src/res/questions.jsonl
+"""
+import json
+import mmap
+import os
+import random
+import struct
+from argparse import ArgumentParser
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Sequence, Union
+
+from src.util.question import Question, QuestionStore, get_all_questions
+
+INDEX_SUFFIX = '.idx'
+_MAGIC = b'QBI1'
+_HEADER = struct.Struct('=4sI')
+
+
+class BankFormatError(ValueError):
+    """Raised when a question bank or its index is malformed"""
+
+
+class _IdIndex(Sequence[str]):
+    """The sorted ids of a bank, decoded from the memory mapped index on access"""
+
+    def __init__(self, index: mmap.mmap, count: int, id_offsets: int, blob: int):
+        self._index = index
+        self._count = count
+        self._offsets = memoryview(index)[id_offsets:blob].cast('I')
+        self._blob = blob
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, position: Union[int, slice]) -> Union[str, list[str]]:
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self._count))]
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError('question id index out of range')
+
+        start = self._blob + self._offsets[position]
+        end = self._blob + self._offsets[position + 1]
+        return self._index[start:end].decode('utf8')
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[i] for i in range(self._count))
+
+
+class QuestionBank:
+    """A memory mapped JSON Lines question bank and its offset index"""
+
+    def __init__(self, file_path: os.PathLike):
+        self.file_path = Path(file_path)
+        index_path = self.file_path.with_name(self.file_path.name + INDEX_SUFFIX)
+
+        with open(self.file_path, 'rb') as file:
+            self._lines = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(index_path, 'rb') as file:
+            self._index = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count = _HEADER.unpack_from(self._index)
+        if magic != _MAGIC:
+            raise BankFormatError(f"{index_path} is not a question bank index")
+
+        ranges = _HEADER.size
+        id_offsets = ranges + count * 16
+        blob = id_offsets + (count + 1) * 4
+        if len(self._index) < blob:
+            raise BankFormatError(f"{index_path} is truncated")
+
+        self._ranges = memoryview(self._index)[ranges:id_offsets].cast('Q')
+        self.ids = _IdIndex(self._index, count, id_offsets, blob)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def load(self, position: int) -> Question:
+        """Decode the question at a position of the sorted ids"""
+        start, end = self._ranges[position * 2], self._ranges[position * 2 + 1]
+        q = json.loads(self._lines[start:end])
+        return Question(q['id'], q['prompt'], q['choices'], q['correct'])
+
+    def store(self, rng: Optional[random.Random] = None) -> QuestionStore:
+        """Returns a store drawing questions from the bank"""
+        return QuestionStore(self.ids, self.load, rng)
+
+    def close(self) -> None:
+        """Unmap the bank"""
+        self._ranges.release()
+        self.ids._offsets.release()
+        self._lines.close()
+        self._index.close()
+
+
+def write_index(file_path: os.PathLike) -> int:
+    """Scan a JSON Lines bank and write its index, returns the number of questions"""
+    file_path = Path(file_path)
+    entries = []
+    with open(file_path, 'rb') as file:
+        start = 0
+        for line in file:
+            end = start + len(line.rstrip(b'\r\n'))
+            if line.strip():
+                entries.append((json.loads(line)['id'].encode('utf8'), start, end))
+            start += len(line)
+
+    # Python sorts str by code point, which is the order utf8 encoded bytes sort in
+    entries.sort()
+
+    ranges = array('Q')
+    id_offsets = array('I', [0])
+    for question_id, start, end in entries:
+        ranges.extend((start, end))
+        id_offsets.append(id_offsets[-1] + len(question_id))
+
+    with open(file_path.with_name(file_path.name + INDEX_SUFFIX), 'wb') as file:
+        file.write(_HEADER.pack(_MAGIC, len(entries)))
+        file.write(ranges.tobytes())
+        file.write(id_offsets.tobytes())
+        file.write(b''.join(question_id for question_id, _, _ in entries))
+    return len(entries)
+
+
+def convert(json_path: os.PathLike, bank_path: os.PathLike) -> int:
+    """Convert a JSON question file into a JSON Lines bank with its index, returns the number of questions"""
+    questions = sorted(get_all_questions(json_path), key=lambda q: q.id)
+    with open(bank_path, 'w', encoding='utf8') as file:
+        for q in questions:
+            file.write(json.dumps(
+                {'id': q.id, 'prompt': q.prompt, 'choices': q.choices, 'correct': q.correct},
+                ensure_ascii=False,
+            ) + '\n')
+    return write_index(bank_path)
+
+
+def bank_path_for(json_path: os.PathLike) -> Optional[Path]:
+    """Returns the converted bank of a JSON question file, if there is one at least as new as the JSON file"""
+    json_path = Path(json_path)
+    bank_path = json_path.with_suffix('.jsonl')
+    index_path = bank_path.with_name(bank_path.name + INDEX_SUFFIX)
+    try:
+        json_time = json_path.stat().st_mtime if json_path.exists() else 0
+        if bank_path.stat().st_mtime >= json_time and index_path.stat().st_mtime >= bank_path.stat().st_mtime:
+            return bank_path
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def open_store(file_path: os.PathLike, rng: Optional[random.Random] = None) -> QuestionStore:
+    """Returns a store over a question file
+
+    A `.jsonl` bank is memory mapped. For a `.json` file, its converted bank is used when one sits next to it and is
+    up to date, otherwise the whole file is loaded into memory. Either way the questions are read once per process and
+    shared by every store opened on the file, each store drawing its own questions.
+    """
+    file_path = Path(file_path)
+    if file_path.suffix != '.jsonl':
+        file_path = bank_path_for(file_path) or file_path
+
+    ids, load = _shared_questions(file_path.resolve())
+    return QuestionStore(ids, load, rng)
+
+
+def clear_cache() -> None:
+    """Forget every question file read so far, so that the next store reads the file again"""
+    _shared_questions.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _shared_questions(file_path: Path) -> tuple[Sequence[str], Callable[[int], Question]]:
+    if file_path.suffix == '.jsonl':
+        bank = QuestionBank(file_path)
+        return bank.ids, bank.load
+
+    questions = sorted(get_all_questions(file_path), key=lambda q: q.id)
+    return [q.id for q in questions], questions.__getitem__
+
+
+def main() -> None:
+    """Convert a JSON question file into a streaming bank"""
+    parser = ArgumentParser(description='Convert a JSON question file into a JSON Lines bank with an offset index')
+    parser.add_argument('json_path', type=Path)
+    parser.add_argument('bank_path', type=Path, nargs='?', default=None, help='defaults to the .jsonl next to it')
+    args = parser.parse_args()
+
+    bank_path = args.json_path.with_suffix('.jsonl') if args.bank_path is None else args.bank_path
+    count = convert(args.json_path, bank_path)
+    print(f"wrote {count} questions to {bank_path}")
+
+
+if __name__ == '__main__':
+    main()
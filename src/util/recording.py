@@ -0,0 +1,250 @@
+"""Recordings of games: the seed, the input of every step and every reading of the clock, in a compact binary log
+
+All the randomness of a game comes from the global random generator, so seeding it makes the worlds and questions
+the same. What the sections do then only depends on their input and on the time they read, which is only read when a
+section starts and on every step (see GameSection.clock). A recording keeps both, in the order they happened, and a
+replay hands them back in the same order: the sections take exactly the same steps and end in the same state, however
+fast the replay runs.
+
+File layout, integers little endian:
+
+    magic b'TIR1', u64 seed, u16 terminal width, u16 terminal height
+    the events, each starting with a varint holding a value shifted left by 2 and the kind of the event:
+        0 clock reading, the value is the number of microseconds since the previous reading
+        1 step without input when the value is 0, end of the recording when the value is 1, followed by the varint
+          length of the final state and the final state as JSON
+        2 keystroke typed before, the value is its index in the order keys were first typed
+        3 keystroke typed for the first time, the value is the length of its sequence, followed by the sequence as
+          utf8
+"""
+import json
+import os
+import queue
+import struct
+import time
+from collections import deque
+from typing import Callable, Iterator, NamedTuple, Optional
+
+from blessed.keyboard import Keystroke
+
+from src.headless import VirtualTerminal
+
+_MAGIC = b'TIR1'
+_HEADER = struct.Struct('<4sQHH')
+
+CLOCK, STEP, KEY, NEW_KEY = range(4)
+# Values of the STEP events
+NO_INPUT, END = range(2)
+
+
+class RecordingError(ValueError):
+    """Raised when a recording is malformed"""
+
+
+def write_varint(buffer: bytearray, value: int) -> None:
+    """Append an unsigned integer to buffer, 7 bits per byte with the high bit set on every byte but the last"""
+    while value > 0x7F:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    """Read an unsigned integer written by write_varint, returns it with the offset after it"""
+    value = shift = 0
+    while True:
+        try:
+            byte = data[offset]
+        except IndexError:
+            raise RecordingError('Recording ends in the middle of an event') from None
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def game_state(manager: object) -> dict:
+    """The state a game ended in, compared after a replay: the world, where the player got to and the questions"""
+    world = manager.over_world.world
+    return {
+        'world_seed': world.seed,
+        'world_location': list(world.world_location),
+        'player_location': list(world.player.get_location()),
+        'completed': world.completed,
+        'questions': list(manager.question.asked),
+    }
+
+
+class Recorder:
+    """Records a game played by a GameManager, see attach()"""
+
+    def __init__(self, seed: int, width: int, height: int):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.manager = None
+        self._events = bytearray()
+        self._keys: dict[str, int] = {}
+        self._last_reading = 0
+
+    def manager_factory(self, manager_cls: type) -> Callable[..., object]:
+        """Wrap a manager class, so that the manager a runtime creates with it is recorded"""
+        def create(*args: object, **kwargs: object) -> object:
+            return self.attach(manager_cls(*args, **kwargs))
+        return create
+
+    def attach(self, manager: object) -> object:
+        """Record the clock and input of every section of a manager, returns the manager"""
+        self.manager = manager
+        manager.configure_sections(clock=self.clock, on_input=self.record_input)
+        return manager
+
+    def clock(self) -> float:
+        """Read the monotonic clock, to the microsecond, and record the reading"""
+        reading = int(time.monotonic() * 1_000_000)
+        write_varint(self._events, (reading - self._last_reading) << 2 | CLOCK)
+        self._last_reading = reading
+        return reading / 1_000_000
+
+    def record_input(self, inp: Optional[Keystroke]) -> None:
+        """Record the input of a step"""
+        if inp is None:
+            write_varint(self._events, NO_INPUT << 2 | STEP)
+            return
+
+        sequence = str(inp)
+        index = self._keys.get(sequence)
+        if index is not None:
+            write_varint(self._events, index << 2 | KEY)
+        else:
+            self._keys[sequence] = len(self._keys)
+            encoded = sequence.encode('utf8')
+            write_varint(self._events, len(encoded) << 2 | NEW_KEY)
+            self._events += encoded
+
+    def to_bytes(self) -> bytes:
+        """The recording so far, ended with the state of the manager"""
+        end = bytearray()
+        write_varint(end, END << 2 | STEP)
+        state = json.dumps(game_state(self.manager) if self.manager is not None else None).encode('utf8')
+        write_varint(end, len(state))
+        end += state
+        return _HEADER.pack(_MAGIC, self.seed, self.width, self.height) + self._events + end
+
+    def save(self, file_path: os.PathLike) -> None:
+        """Write the recording to a file"""
+        with open(file_path, 'wb') as file:
+            file.write(self.to_bytes())
+
+
+class Recording(NamedTuple):
+    """A recorded game, read back"""
+
+    seed: int
+    width: int
+    height: int
+    # Clock readings in seconds, as the sections read them
+    readings: list[float]
+    # The input of every step, the sequence of a keystroke or None
+    inputs: list[Optional[str]]
+    state: Optional[dict]
+
+    @classmethod
+    def load(cls, file_path: os.PathLike) -> 'Recording':
+        """Read a recording from a file"""
+        with open(file_path, 'rb') as file:
+            return cls.from_bytes(file.read())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Recording':
+        """Read a recording"""
+        if len(data) < _HEADER.size or data[:4] != _MAGIC:
+            raise RecordingError('Not a game recording')
+        _, seed, width, height = _HEADER.unpack_from(data)
+
+        readings = []
+        inputs = []
+        keys = []
+        state = None
+        reading = 0
+        offset = _HEADER.size
+        while offset < len(data):
+            event, offset = read_varint(data, offset)
+            kind, value = event & 3, event >> 2
+            if kind == CLOCK:
+                reading += value
+                readings.append(reading / 1_000_000)
+            elif kind == KEY:
+                inputs.append(keys[value])
+            elif kind == NEW_KEY:
+                keys.append(data[offset:offset + value].decode('utf8'))
+                offset += value
+                inputs.append(keys[-1])
+            elif value == NO_INPUT:
+                inputs.append(None)
+            else:
+                length, offset = read_varint(data, offset)
+                state = json.loads(data[offset:offset + length])
+                break
+
+        return cls(seed, width, height, readings, inputs, state)
+
+
+class ReplayInput:
+    """Stands in for the input queue and the clock of the sections, handing back what a recording holds
+
+    Inputs and clock readings are handed out in the order they were recorded, an input of None is a step the section
+    took without input and raises queue.Empty. Played as fast as possible nothing ever waits, in real time every
+    input is held back until the time of the step it was recorded in. Once the recording runs out every read returns
+    Ctrl+C, which ends the game.
+    """
+
+    def __init__(self, terminal: VirtualTerminal, recording: Recording, realtime: bool = False):
+        self._terminal = terminal
+        self._inputs: Iterator[Optional[str]] = iter(recording.inputs)
+        self._readings = deque(recording.readings)
+        self._end = terminal.keystroke(chr(3))
+        self.realtime = realtime
+        # Where the recorded clock readings start on this clock, to play them back in real time
+        self._offset = time.monotonic() - (recording.readings[0] if recording.readings else 0.0)
+        self._last_reading = 0.0
+        self.exhausted = False
+        self.steps = 0
+
+    def clock(self) -> float:
+        """The next clock reading of the recording"""
+        if self._readings:
+            self._last_reading = self._readings.popleft()
+        return self._last_reading
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Keystroke:
+        """Returns the input of the next step"""
+        try:
+            sequence = next(self._inputs)
+        except StopIteration:
+            self.exhausted = True
+            return self._end
+
+        if self.realtime and self._readings:
+            # The step reads the clock after taking its input
+            delay = self._readings[0] + self._offset - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        self.steps += 1
+        if sequence is None:
+            raise queue.Empty
+        return self._terminal.keystroke(sequence)
+
+    def get_nowait(self) -> Keystroke:
+        """Returns the input of the next step"""
+        return self.get(False)
+
+    def put(self, key: str) -> None:
+        """Replayed input can not be added to"""
+        raise queue.Full('Replayed input can not be added to')
+
+    def qsize(self) -> int:
+        """Recorded input is handed out one step at a time"""
+        return 0
@@ -0,0 +1,91 @@
+"""This module contains a damage tracking renderer for grids of fixed width cells."""
+from typing import Callable, Optional, Sequence
+
+from blessed import Terminal
+
+
+class CellRenderer:
+    """Double buffered renderer for a grid of cells centred in the terminal
+
+    The renderer remembers the last frame it drew (the front buffer) and compares each new frame to it, emitting
+    cursor moves and glyphs only for the cells that changed. A full repaint happens on the first frame, whenever the
+    scene (e.g. the room) or the terminal size changes, and after invalidate() is called.
+
+    The renderer also owns a back buffer that scenes draw their next frame into, so a scene does not need to keep a
+    display of its own.
+    """
+
+    def __init__(self, cell_width: int = 2):
+        self.cell_width = cell_width
+        self.last_frame_bytes = 0
+        self.total_bytes = 0
+        self.frames = 0
+        self._front: Optional[list[list[str]]] = None
+        self._back: Optional[list[list[str]]] = None
+        self._scene: object = None
+        self._terminal_size: tuple[int, int] = (0, 0)
+
+    def back_buffer(self, width: int, height: int) -> list[list[str]]:
+        """Rows of cells to draw the next frame into, reused from one frame to the next"""
+        if self._back is None or len(self._back) != height or len(self._back[0]) != width:
+            self._back = [[""] * width for _ in range(height)]
+        return self._back
+
+    def invalidate(self) -> None:
+        """Force the next frame to repaint the whole screen, e.g. after something else drew over it"""
+        self._front = None
+
+    def render(
+            self,
+            terminal: Terminal,
+            echo: Callable[[str], None],
+            rows: Sequence[Sequence[str]],
+            scene: object = None,
+    ) -> int:
+        """Draw a frame of cells and return the number of bytes written"""
+        terminal_size = (terminal.width, terminal.height)
+        origin_x = (terminal.width - len(rows[0]) * self.cell_width) // 2
+        origin_y = (terminal.height - len(rows)) // 2
+
+        if self._front is None or scene is not self._scene or terminal_size != self._terminal_size:
+            frame = self._repaint(terminal, rows, origin_x, origin_y)
+        else:
+            frame = self._diff(terminal, rows, origin_x, origin_y)
+
+        self._scene = scene
+        self._terminal_size = terminal_size
+
+        if frame:
+            echo(frame)
+
+        self.last_frame_bytes = len(frame.encode('utf8'))
+        self.total_bytes += self.last_frame_bytes
+        self.frames += 1
+        return self.last_frame_bytes
+
+    def _repaint(self, terminal: Terminal, rows: Sequence[Sequence[str]], origin_x: int, origin_y: int) -> str:
+        parts = [terminal.home, terminal.clear]
+        for y, row in enumerate(rows):
+            parts.append(terminal.move_xy(origin_x, origin_y + y))
+            parts.append("".join(row))
+
+        self._front = [list(row) for row in rows]
+        return "".join(parts)
+
+    def _diff(self, terminal: Terminal, rows: Sequence[Sequence[str]], origin_x: int, origin_y: int) -> str:
+        parts = []
+        for y, row in enumerate(rows):
+            front_row = self._front[y]
+            # The cursor sits right after the last glyph written, so neighbouring changes need no cursor move
+            cursor_x = None
+            for x, glyph in enumerate(row):
+                if front_row[x] == glyph:
+                    continue
+
+                if cursor_x != x:
+                    parts.append(terminal.move_xy(origin_x + x * self.cell_width, origin_y + y))
+                parts.append(glyph)
+                front_row[x] = glyph
+                cursor_x = x + 1
+
+        return "".join(parts)
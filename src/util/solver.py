@@ -0,0 +1,143 @@
+"""Solver for the mazes of src.util.maze
+
+The solver runs one breadth first search back from the exit over the maze matrix, and records for every open cell
+its distance to the exit and the direction to step in to get closer to it. Everything else (whether the maze is
+solvable, the shortest path, hints) is then an O(1) lookup per cell.
+"""
+from array import array
+from typing import Optional, Union
+
+from src.util.maze import Maze
+
+# Direction names, indexed by the direction codes stored in the field
+DIRECTIONS = ('up', 'down', 'left', 'right')
+UP, DOWN, LEFT, RIGHT = range(4)
+# Direction code of the cells that can not reach the exit, and of the exit itself
+NO_DIRECTION = 255
+UNREACHABLE = 0xFFFFFFFF
+
+
+class DistanceField:
+    """Distance to the exit of every cell of a maze, and the next direction to take from it towards the exit
+
+    The field is stored as flat arrays padded with an empty row above and below the maze and an empty column after
+    every row, so the search never needs bounds checks, even for mazes that are open on their edges.
+    """
+
+    def __init__(self, maze: Maze):
+        self.width = maze.width
+        self.height = maze.height
+        self.exit = (maze.exit_index, maze.height - 1)
+        self.entrance = (maze.entrance_index, 0)
+
+        # Width of the padded rows
+        width = self._stride = self.width + 1
+        size = width * (self.height + 2)
+        self.distances = array('I', [UNREACHABLE]) * size
+        self.directions = bytearray([NO_DIRECTION]) * size
+
+        # Open cells not reached yet, padded like the field
+        cells = memoryview(maze.cell_bytes())
+        unvisited = bytearray(width)
+        for y in range(self.height):
+            unvisited += cells[y * self.width:(y + 1) * self.width]
+            unvisited.append(0)
+        unvisited += bytearray(width)
+        start = self._index(*self.exit)
+        unvisited[start] = 0
+        self.distances[start] = 0
+
+        # The search goes one distance at a time. A neighbour reached by stepping up from a cell gets to the exit by
+        # stepping down to that cell, and so on. The four steps are unrolled as this loop visits every open cell.
+        distances = self.distances
+        directions = self.directions
+        frontier = [start]
+        distance = 0
+        while frontier:
+            distance += 1
+            reached = []
+            append = reached.append
+            for cell in frontier:
+                neighbour = cell - width
+                if unvisited[neighbour]:
+                    unvisited[neighbour] = 0
+                    distances[neighbour] = distance
+                    directions[neighbour] = DOWN
+                    append(neighbour)
+                neighbour = cell + width
+                if unvisited[neighbour]:
+                    unvisited[neighbour] = 0
+                    distances[neighbour] = distance
+                    directions[neighbour] = UP
+                    append(neighbour)
+                neighbour = cell - 1
+                if unvisited[neighbour]:
+                    unvisited[neighbour] = 0
+                    distances[neighbour] = distance
+                    directions[neighbour] = RIGHT
+                    append(neighbour)
+                neighbour = cell + 1
+                if unvisited[neighbour]:
+                    unvisited[neighbour] = 0
+                    distances[neighbour] = distance
+                    directions[neighbour] = LEFT
+                    append(neighbour)
+            frontier = reached
+
+    def _index(self, x: int, y: int) -> int:
+        return (y + 1) * self._stride + x
+
+    def _in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    @property
+    def solvable(self) -> bool:
+        """Whether the exit can be reached from the entrance"""
+        return self.distance(*self.entrance) is not None
+
+    def distance(self, x: int, y: int) -> Optional[int]:
+        """The number of steps from (x, y) to the exit, None if the exit can not be reached from there"""
+        if not self._in_bounds(x, y):
+            return None
+        distance = self.distances[self._index(x, y)]
+        return None if distance == UNREACHABLE else distance
+
+    def next_direction(self, x: int, y: int) -> Optional[str]:
+        """The direction to step in from (x, y) to get closer to the exit, None at the exit or off the path"""
+        if not self._in_bounds(x, y):
+            return None
+        direction = self.directions[self._index(x, y)]
+        return None if direction == NO_DIRECTION else DIRECTIONS[direction]
+
+    def path(self, x: int, y: int) -> Optional[list[tuple[int, int]]]:
+        """The cells of the shortest path from (x, y) to the exit, both included"""
+        if self.distance(x, y) is None:
+            return None
+
+        moves = {'up': (0, -1), 'down': (0, 1), 'left': (-1, 0), 'right': (1, 0)}
+        path = [(x, y)]
+        direction = self.next_direction(x, y)
+        while direction is not None:
+            dx, dy = moves[direction]
+            x, y = x + dx, y + dy
+            path.append((x, y))
+            direction = self.next_direction(x, y)
+        return path
+
+
+def distance_field(maze: Union[Maze, list[list[bool]]]) -> DistanceField:
+    """Returns the distance field of a maze, given as a Maze or a nested list matrix"""
+    if not isinstance(maze, Maze):
+        maze = Maze.from_list(maze)
+    return DistanceField(maze)
+
+
+def shortest_path(maze: Union[Maze, list[list[bool]]]) -> Optional[list[tuple[int, int]]]:
+    """Returns the cells of the shortest path from the entrance to the exit, None if the maze can not be solved"""
+    field = distance_field(maze)
+    return field.path(*field.entrance)
+
+
+def is_solvable(maze: Union[Maze, list[list[bool]]]) -> bool:
+    """Returns whether the exit of a maze can be reached from its entrance"""
+    return distance_field(maze).solvable
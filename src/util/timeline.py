@@ -0,0 +1,82 @@
+"""This module contains the timeline that game sections schedule their animations on."""
+import math
+from collections import deque
+from typing import Callable
+
+from blessed import Terminal
+
+# An effect draws a step of an animation, it is called with the terminal and the echo of the frame
+Effect = Callable[[Terminal, Callable[[str], None]], None]
+
+
+class Timeline:
+    """Effects scheduled at points in time, run in order as the clock of the timeline advances
+
+    Effects are added one after the other with then(), and wait() leaves a gap before the next one. The clock does not
+    run by itself: the section advances it on every tick, and the effects that became due are run in the next frame.
+    Nothing ever sleeps, so input keeps being processed while an animation plays and skip() can jump to its end.
+
+    Once every effect is due the clock restarts, so the next animation is scheduled from zero. The speed scales how
+    fast the clock advances, an infinite speed makes every effect due straight away.
+    """
+
+    def __init__(self, speed: float = 1.0):
+        self.speed = speed
+        self.clock = 0.0
+        self._end = 0.0
+        self._scheduled: deque[tuple[float, Effect]] = deque()
+        self._due: list[Effect] = []
+
+    @property
+    def active(self) -> bool:
+        """Whether some effects have not been run yet"""
+        return bool(self._scheduled or self._due)
+
+    @property
+    def has_due(self) -> bool:
+        """Whether some effects are waiting to be run"""
+        return bool(self._due)
+
+    def then(self, effect: Effect) -> 'Timeline':
+        """Schedule an effect after everything scheduled so far"""
+        self._scheduled.append((self._end, effect))
+        return self
+
+    def wait(self, seconds: float) -> 'Timeline':
+        """Leave a gap of a number of seconds before the next effect"""
+        self._end += seconds
+        return self
+
+    def advance(self, seconds: float) -> bool:
+        """Move the clock forward by a number of seconds, returns whether some effects are due"""
+        if self._scheduled:
+            self.clock = math.inf if self.speed == math.inf else self.clock + seconds * self.speed
+            while self._scheduled and self._scheduled[0][0] <= self.clock:
+                self._due.append(self._scheduled.popleft()[1])
+            if not self._scheduled:
+                self._restart()
+        return bool(self._due)
+
+    def skip(self) -> bool:
+        """Make every effect due, returns whether there are any"""
+        self._due.extend(effect for _, effect in self._scheduled)
+        self._scheduled.clear()
+        self._restart()
+        return bool(self._due)
+
+    def run_due(self, terminal: Terminal, echo: Callable[[str], None]) -> None:
+        """Run the effects that are due, in the order they were scheduled"""
+        due, self._due = self._due, []
+        for effect in due:
+            effect(terminal, echo)
+
+    def clear(self) -> None:
+        """Drop every effect and restart the clock"""
+        self._scheduled.clear()
+        self._due.clear()
+        self._restart()
+
+    def _restart(self) -> None:
+        # Once everything scheduled is due, the next effects are scheduled from a fresh clock
+        self.clock = 0.0
+        self._end = 0.0
@@ -0,0 +1,24 @@
+from pathlib import Path
+
+import pytest
+
+from src.sections import over_world
+from src.util.level_pack import generate_record, level_seed, write_pack
+
+
+@pytest.mark.parametrize('damage', [
+    lambda pack: b'TLP1' + pack[4:],
+    lambda pack: pack[:len(pack) - 40],
+])
+def test_over_world_plays_the_demo_maze_when_the_pack_is_unreadable(
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        damage: object,
+) -> None:
+    """A pack of an older format or a truncated one falls back to the demo maze instead of crashing"""
+    pack_path = tmp_path / 'levels.pack'
+    write_pack(pack_path, 42, [generate_record(level_seed(42, 0), 15, 15)])
+    pack_path.write_bytes(damage(pack_path.read_bytes()))
+    monkeypatch.setattr(over_world, 'LEVEL_PACK_PATH', pack_path)
+
+    assert over_world.OverWorld._load_world().maze_data['length'] == len(over_world._DEMO_MAZE)
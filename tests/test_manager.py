@@ -0,0 +1,18 @@
+import queue
+
+from src.headless import VirtualTerminal
+from src.manager import GameManager
+
+
+def test_games_do_not_share_metrics() -> None:
+    """The overlay and the frame timings of one game are not those of another game played at the same time"""
+    terminal = VirtualTerminal()
+    first = GameManager(queue.Queue(), terminal, warm_up=False)
+    second = GameManager(queue.Queue(), terminal, warm_up=False)
+
+    first.menu._toggle_overlay(terminal)
+    assert first.metrics.overlay_visible
+    assert first.game_over.game_metrics is first.metrics
+    assert not second.metrics.overlay_visible
+    assert first.menu.metrics is not second.menu.metrics
+    assert first.menu.metrics.frame.count == 0
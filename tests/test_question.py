@@ -0,0 +1,43 @@
+import queue
+
+from src.headless import VirtualTerminal
+from src.sections.question import NewQuestion, Question, QuestionScreenState
+
+
+class FakeClock:
+    """A clock that only moves when the test moves it"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """The current time of the clock"""
+        return self.now
+
+
+def test_answer_is_shown_after_an_idle_wait() -> None:
+    """An answer given long after the question was written is still shown for its full three seconds"""
+    terminal = VirtualTerminal()
+    section = Question(queue.Queue())
+    section.clock = clock = FakeClock()
+    section.start_loop(terminal, NewQuestion())
+
+    # Start writing the question, then skip to the end of it
+    section.step(terminal, None)
+    section.step(terminal, terminal.keystroke(' '))
+    assert section.state == QuestionScreenState.USER_SELECTION
+    assert not section.timeline.active
+
+    # The player thinks about it for a while, nothing steps as nothing is ticking
+    clock.now += 10
+    section.step(terminal, terminal.keystroke('KEY_ENTER'))
+    assert section.state == QuestionScreenState.REVEAL_ANSWER
+    assert section.running
+
+    clock.now += 2.9
+    section.step(terminal, None)
+    assert section.running
+
+    clock.now += 0.2
+    section.step(terminal, None)
+    assert not section.running
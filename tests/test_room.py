@@ -0,0 +1,38 @@
+import random
+import tracemalloc
+
+from src.GameObjects.assets import ROOM_SIZE
+from src.GameObjects.game_objects import Player, Room
+from src.util.renderer import CellRenderer
+
+# Bytes allowed for what tracemalloc itself and the interpreter may allocate while the room is stepped
+RETAINED_TOLERANCE = 1024
+PEAK_TOLERANCE = 4096
+
+
+def step(room: Room, rows: list[list[str]], iterations: int) -> None:
+    """Walk the player back and forth, drawing the room after every move"""
+    for index in range(iterations):
+        room.move_entity("left" if index % 2 else "right", "player")
+        room.draw(rows)
+
+
+def test_moving_and_drawing_does_not_allocate() -> None:
+    """Moving entities and drawing a room retain no memory in the steady state, however many steps are taken"""
+    room = Room("4-way-junction", 0, rng=random.Random(0))
+    room.add_entity('player', Player(5, 2))
+    rows = CellRenderer().back_buffer(ROOM_SIZE, ROOM_SIZE)
+    # Warm up so that any lazily built tables exist before measuring
+    step(room, rows, 100)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        step(room, rows, 10_000)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert after - before <= RETAINED_TOLERANCE
+    assert peak - before <= PEAK_TOLERANCE
@@ -0,0 +1,45 @@
+import pytest
+
+from src import server
+from src.server import ConnectionStream
+
+
+class StalledWriter:
+    """A stream writer whose client never reads, everything written stays in the transport's buffer"""
+
+    def __init__(self):
+        self.transport = self
+        self.buffered = 0
+        self.aborted = False
+
+    def write(self, data: bytes) -> None:
+        """Buffer data"""
+        self.buffered += len(data)
+
+    def get_write_buffer_size(self) -> int:
+        """The bytes the client has not read"""
+        return self.buffered
+
+    def abort(self) -> None:
+        """Drop the connection"""
+        self.aborted = True
+
+    def is_closing(self) -> bool:
+        """Whether the connection is dropped"""
+        return self.aborted
+
+
+def test_a_client_not_reading_is_dropped(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Frames are buffered up to the limit, then the connection is dropped instead of buffering more"""
+    monkeypatch.setattr(server, 'WRITE_BUFFER_LIMIT', 100)
+    writer = StalledWriter()
+    stream = ConnectionStream(writer)
+
+    for _ in range(10):
+        stream.write('x' * 10)
+    assert writer.buffered == 100
+    assert not writer.aborted
+
+    stream.write('x')
+    assert writer.aborted
+    assert writer.buffered == 100
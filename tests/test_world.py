@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from src.GameObjects.game_objects import EndlessWorld, World
+from src.util import maze
+
+MAZE = [
+    [False, False, False, True, False],
+    [False, True, False, True, False],
+    [False, True, True, True, False],
+    [False, True, False, True, False],
+    [False, True, False, False, False],
+]
+
+
+def test_cleared_npc_stays_cleared_after_eviction() -> None:
+    """An NPC moved out of the way is still out of the way when its room is rebuilt after being evicted"""
+    world = World(MAZE, seed=1, cache_size=1)
+    first = world.world_location
+    room = world.active_room
+    npc_name = next(name for name in room.entity_dict if name != 'player')
+    assert any(room.move_entity(direction, npc_name) for direction in ('up', 'down', 'left', 'right'))
+    moved_cell = room.entity_dict[npc_name].cell
+
+    world.update_world_location(first[0] + 1, first[1])
+    assert tuple(first) not in world.world_matrix.rooms
+
+    world.update_world_location(*first)
+    rebuilt = world.active_room
+    assert rebuilt is not room
+    assert rebuilt.entity_dict[npc_name].cell == moved_cell
+    assert rebuilt.occupancy == {moved_cell: npc_name}
+
+
+def test_planning_every_room_matches_planning_them_one_by_one() -> None:
+    """The rooms planned in one pass over the maze are the rooms planned as they are entered"""
+    for seed in range(3):
+        world = World(maze.generate(21, 13, rng=random.Random(seed)), seed=seed)
+        plans = {
+            (row_index, column_index): world.room_plan(row_index, column_index)
+            for row_index in range(13) for column_index in range(21)
+        }
+        assert world.plan_rooms() == {location: plan for location, plan in plans.items() if plan is not None}
+
+
+def test_endless_world_rows_are_unbounded() -> None:
+    """The rows of an endless world can be indexed however far down they are, but have no length"""
+    world = EndlessWorld(seed=1)
+    try:
+        row_index = 10 * world.raw_matrix.chunk_height
+        assert world.world_matrix[row_index][1] is world.world_matrix.room(row_index, 1)
+        with pytest.raises(IndexError):
+            world.world_matrix[-1]
+        with pytest.raises(TypeError):
+            len(world.world_matrix)
+    finally:
+        world.close()